@@ -4,8 +4,14 @@ Modelo para validaciones de datos ETL
 
 from datetime import datetime
 from typing import Dict, List, Optional
+import csv
+import io
+import json
 from .base import BaseModel
 
+# Marcador de NULL para el COPY CSV: sin él, un campo vacío sin comillas ('' o None) se carga como NULL
+_COPY_NULL = r"\N"
+
 
 class ETLDataValidation(BaseModel):
     """Modelo para validaciones de datos ETL"""
@@ -22,6 +28,43 @@ class ETLDataValidation(BaseModel):
         self.validation_result = validation_result or {}
         self.severity = severity
     
+    @classmethod
+    def bulk_save(cls, session_id: str, validations: List[Dict]):
+        """Guardar varias validaciones en un solo COPY FROM STDIN"""
+        if not validations:
+            return
+        
+        # CSV y no formato text: el JSON puede contener barras invertidas que text interpretaría
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for validation in validations:
+            row = (
+                session_id,
+                validation["column_name"],
+                validation["validation_type"],
+                json.dumps(validation["validation_result"]),
+                validation["severity"]
+            )
+            writer.writerow(_COPY_NULL if value is None else value for value in row)
+        buffer.seek(0)
+        
+        conn = cls.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.copy_expert(
+                f"COPY {cls.table_name} (session_id, column_name, validation_type, validation_result, severity) "
+                f"FROM STDIN WITH (FORMAT CSV, NULL '{_COPY_NULL}')",
+                buffer
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cursor.close()
+            conn.close()
+    
     @classmethod
     def find_by_session(cls, session_id: str):
         """Buscar validaciones por session_id"""
@@ -44,13 +44,13 @@ class JobManager:
                     result = job_func(*args, **kwargs)
                     self._update_job_status(job_id, "completed", result=result)
                 except Exception as e:
-                    self.logger.error(f"Error en trabajo {job_id}: {e}")
+                    self.logger.error("Error en trabajo %s: %s", job_id, e)
                     self._update_job_status(job_id, "failed", error=str(e))
                 
                 self.job_queue.task_done()
                 
             except Exception as e:
-                self.logger.error(f"Error en worker loop: {e}")
+                self.logger.error("Error en worker loop: %s", e)
     
     def submit_job(self, func: Callable, *args, priority: int = 0, **kwargs) -> str:
         """Enviar un nuevo trabajo"""
@@ -85,7 +85,7 @@ class JobManager:
             ))
             conn.commit()
         except Exception as e:
-            self.logger.error(f"Error creando registro de trabajo: {e}")
+            self.logger.error("Error creando registro de trabajo: %s", e)
             conn.rollback()
         finally:
             cursor.close()
@@ -125,7 +125,7 @@ class JobManager:
             conn.commit()
             
         except Exception as e:
-            self.logger.error(f"Error actualizando estado de trabajo: {e}")
+            self.logger.error("Error actualizando estado de trabajo: %s", e)
             conn.rollback()
         finally:
             cursor.close()
@@ -182,7 +182,7 @@ class JobManager:
             conn.commit()
             
         except Exception as e:
-            self.logger.error(f"Error actualizando progreso: {e}")
+            self.logger.error("Error actualizando progreso: %s", e)
             conn.rollback()
         finally:
             cursor.close()
@@ -210,7 +210,7 @@ class JobManager:
             return cancelled
             
         except Exception as e:
-            self.logger.error(f"Error cancelando trabajo: {e}")
+            self.logger.error("Error cancelando trabajo: %s", e)
             conn.rollback()
             return False
         finally:
@@ -265,10 +265,10 @@ class JobManager:
             deleted = cursor.rowcount
             conn.commit()
             
-            self.logger.info(f"Limpiados {deleted} trabajos antiguos")
+            self.logger.info("Limpiados %s trabajos antiguos", deleted)
             
         except Exception as e:
-            self.logger.error(f"Error limpiando trabajos antiguos: {e}")
+            self.logger.error("Error limpiando trabajos antiguos: %s", e)
             conn.rollback()
         finally:
             cursor.close()
@@ -295,7 +295,7 @@ class JobManager:
             conn.commit()
             
         except Exception as e:
-            self.logger.error(f"Error actualizando trabajos pendientes: {e}")
+            self.logger.error("Error actualizando trabajos pendientes: %s", e)
             conn.rollback()
         finally:
             cursor.close()
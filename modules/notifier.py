@@ -39,7 +39,7 @@ class NotificationManager:
                     self._log_notification(config.id, context.get('load_history_id'), event_type, 
                                          'sent' if success else 'failed', context)
                 except Exception as e:
-                    self.logger.error(f"Error enviando notificación {config.name}: {e}")
+                    self.logger.error("Error enviando notificación %s: %s", config.name, e)
                     self._log_notification(config.id, context.get('load_history_id'), event_type, 
                                          'failed', context, str(e))
     
@@ -78,7 +78,7 @@ class NotificationManager:
         elif notification_type == 'webhook':
             return self._send_webhook_notification(config, event_type, context)
         else:
-            self.logger.error(f"Tipo de notificación no soportado: {notification_type}")
+            self.logger.error("Tipo de notificación no soportado: %s", notification_type)
             return False
     
     def _send_email_notification(self, config: ETLNotificationConfig, event_type: str, context: Dict) -> bool:
@@ -112,7 +112,7 @@ class NotificationManager:
             return True
             
         except Exception as e:
-            self.logger.error(f"Error enviando email: {e}")
+            self.logger.error("Error enviando email: %s", e)
             return False
     
     def _send_slack_notification(self, config: ETLNotificationConfig, event_type: str, context: Dict) -> bool:
@@ -133,7 +133,7 @@ class NotificationManager:
             return response.status_code == 200
             
         except Exception as e:
-            self.logger.error(f"Error enviando mensaje a Slack: {e}")
+            self.logger.error("Error enviando mensaje a Slack: %s", e)
             return False
     
     def _send_telegram_notification(self, config: ETLNotificationConfig, event_type: str, context: Dict) -> bool:
@@ -157,7 +157,7 @@ class NotificationManager:
             return response.status_code == 200
             
         except Exception as e:
-            self.logger.error(f"Error enviando mensaje a Telegram: {e}")
+            self.logger.error("Error enviando mensaje a Telegram: %s", e)
             return False
     
     def _send_webhook_notification(self, config: ETLNotificationConfig, event_type: str, context: Dict) -> bool:
@@ -185,7 +185,7 @@ class NotificationManager:
             return response.status_code in [200, 201, 202]
             
         except Exception as e:
-            self.logger.error(f"Error enviando webhook: {e}")
+            self.logger.error("Error enviando webhook: %s", e)
             return False
     
     def _generate_email_subject(self, event_type: str, context: Dict) -> str:
@@ -335,7 +335,7 @@ class NotificationManager:
             )
             log.save()
         except Exception as e:
-            self.logger.error(f"Error guardando log de notificación: {e}")
+            self.logger.error("Error guardando log de notificación: %s", e)
     
     @classmethod
     def create_notification_config(cls, name: str, notification_type: str, 
@@ -4,28 +4,85 @@ Módulo de procesamiento de datos para ETL
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import io
+import threading
+import queue
+import time
+from operator import itemgetter
+from itertools import islice
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from psycopg2.extras import execute_values, execute_batch
+from psycopg2.pool import ThreadedConnectionPool
 from .validator import DataValidator
 from .transformer import DataTransformer
 from models.history import ETLLoadHistory
+from models.base import BaseModel
+from config import DATABASE_CONFIG
+
+# Importación opcional de PyArrow para lectura de CSV
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Importación opcional del driver ADBC para ingesta Arrow nativa
+try:
+    import adbc_driver_postgresql.dbapi as adbc
+    ADBC_AVAILABLE = PYARROW_AVAILABLE
+except ImportError:
+    ADBC_AVAILABLE = False
+
+# Tamaño de bloque del lector CSV de PyArrow; los tipos se infieren del primer bloque
+_ARROW_CSV_BLOCK_SIZE = 8 << 20
 
 
 class DataProcessor:
     """Procesador principal de datos ETL"""
     
-    def __init__(self, session_id: str, chunk_size: int = 1000):
+    def __init__(self, session_id: str, chunk_size: int = 1000, use_copy: bool = True,
+                 use_adbc: bool = False, max_workers: int = 1, use_arrow_strings: bool = False,
+                 use_arrow_csv: bool = False, validation_workers: int = 1,
+                 validation_processes: bool = False):
         self.session_id = session_id
         self.chunk_size = chunk_size
-        self.validator = DataValidator(session_id)
-        self.transformer = DataTransformer(session_id)
+        # Con max_workers > 1 los chunks se procesan en paralelo, cada uno con su conexión
+        self.max_workers = max(1, max_workers)
+        # COPY no dispara reglas (RULE) de la tabla; use_copy=False fuerza sentencias INSERT
+        self.use_copy = use_copy
+        # La ingesta ADBC exige que los tipos del chunk coincidan con los de la tabla destino
+        self.use_adbc = use_adbc and ADBC_AVAILABLE
+        self._adbc_local = threading.local()
+        self._adbc_connections = []
+        # El lector CSV de PyArrow fija los tipos con el primer bloque y convierte fechas ISO a
+        # datetime.date, a diferencia de pandas; por eso es opcional
+        self.use_arrow_csv = use_arrow_csv and PYARROW_AVAILABLE
+        # Claves primarias por tabla; el catálogo se consulta una vez por carga
+        self._pk_cache = {}
+        # Sentencias y empaquetadores por (tabla, columnas, claves), fijos durante la carga
+        self._statement_cache = {}
+        # Columnas de cada chunk validadas en paralelo (hilos o, con validation_processes, procesos);
+        # con max_workers > 1 cada chunk en curso abre su propio pool
+        self.validator = DataValidator(
+            session_id,
+            max_workers=validation_workers,
+            use_processes=validation_processes,
+            use_arrow_strings=use_arrow_strings
+        )
+        self.transformer = DataTransformer(session_id, use_arrow_strings=use_arrow_strings)
         self.logger = logging.getLogger(__name__)
         self.load_history = None
+        self._last_progress_log = 0.0
     
     def process_file(self, file_path: str, config: Dict) -> Dict:
         """Procesar archivo completo con configuración dada"""
+        # Reloj monotónico: inmune a ajustes del reloj del sistema durante la carga
+        start_ns = time.monotonic_ns()
+        
         try:
             # Iniciar registro de historial
             self.load_history = ETLLoadHistory(
@@ -39,30 +96,31 @@ class DataProcessor:
             self.load_history.save()
             
             # Leer archivo en chunks
-            chunks = pd.read_csv(file_path, chunksize=self.chunk_size)
-            total_rows = 0
-            processed_rows = 0
-            error_rows = 0
+            column_types = self._get_source_column_types(config) if config.get('typed_csv') else None
+            chunks = self._prefetch_chunks(self._read_chunks(file_path, column_types))
+            totals = {"total": 0, "processed": 0, "errors": 0}
             
             # Procesar cada chunk
-            start_time = datetime.now()
+            if self.max_workers > 1:
+                self._process_chunks_parallel(chunks, config, totals)
+            else:
+                # Una sola conexión para toda la carga; cada chunk hace commit o rollback propio
+                conn = BaseModel.get_connection()
+                try:
+                    for chunk_num, chunk in enumerate(chunks, 1):
+                        chunk_result = self._process_chunk(chunk, config, chunk_num, conn)
+                        self._accumulate_chunk_result(totals, chunk_result)
+                finally:
+                    conn.close()
             
-            for chunk_num, chunk in enumerate(chunks, 1):
-                chunk_result = self._process_chunk(
-                    chunk, 
-                    config, 
-                    chunk_num
-                )
-                
-                total_rows += chunk_result['total']
-                processed_rows += chunk_result['processed']
-                error_rows += chunk_result['errors']
-                
-                # Actualizar progreso
-                self._update_progress(processed_rows, total_rows)
+            self._update_progress(totals['processed'], totals['total'], final=True)
+            
+            total_rows = totals['total']
+            processed_rows = totals['processed']
+            error_rows = totals['errors']
             
             # Calcular tiempo total
-            execution_time = int((datetime.now() - start_time).total_seconds())
+            execution_time = (time.monotonic_ns() - start_ns) // 1_000_000_000
             
             # Actualizar historial con resultados finales
             self.load_history.complete_successfully(
@@ -89,15 +147,188 @@ class DataProcessor:
             if self.load_history:
                 self.load_history.fail_with_error(
                     error_message=error_msg,
-                    execution_time=int((datetime.now() - start_time).total_seconds())
+                    execution_time=(time.monotonic_ns() - start_ns) // 1_000_000_000
                 )
             
             return {
                 "success": False,
                 "error": error_msg
             }
+        
+        finally:
+            for adbc_conn in self._adbc_connections:
+                adbc_conn.close()
+            self._adbc_connections = []
+            self._adbc_local = threading.local()
+    
+    def _process_chunks_parallel(self, chunks, config: Dict, totals: Dict):
+        """Procesar chunks en un pool de hilos con una conexión del pool por tarea"""
+        pool = ThreadedConnectionPool(1, self.max_workers, **DATABASE_CONFIG)
+        
+        def run(chunk: pd.DataFrame, chunk_num: int) -> Dict:
+            conn = pool.getconn()
+            try:
+                return self._process_chunk(chunk, config, chunk_num, conn)
+            finally:
+                pool.putconn(conn)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pending = set()
+                
+                for chunk_num, chunk in enumerate(chunks, 1):
+                    pending.add(executor.submit(run, chunk, chunk_num))
+                    
+                    # Limitar chunks en vuelo para no cargar el archivo completo en memoria
+                    if len(pending) >= self.max_workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._accumulate_chunk_result(totals, future.result())
+                
+                for future in as_completed(pending):
+                    self._accumulate_chunk_result(totals, future.result())
+        finally:
+            pool.closeall()
+    
+    def _accumulate_chunk_result(self, totals: Dict, chunk_result: Dict):
+        """Sumar el resultado de un chunk a los totales y actualizar progreso"""
+        totals['total'] += chunk_result['total']
+        totals['processed'] += chunk_result['processed']
+        totals['errors'] += chunk_result['errors']
+        
+        # Actualizar progreso
+        self._update_progress(totals['processed'], totals['total'])
+    
+    def _read_chunks(self, file_path: str, column_types: Optional[Dict] = None):
+        """Leer el archivo CSV en chunks de chunk_size filas"""
+        if not self.use_arrow_csv:
+            yield from pd.read_csv(file_path, chunksize=self.chunk_size)
+            return
+        
+        rows_read = 0
+        try:
+            # El lector de PyArrow parsea bloques directamente a memoria columnar
+            reader = pa_csv.open_csv(
+                file_path,
+                read_options=pa_csv.ReadOptions(block_size=_ARROW_CSV_BLOCK_SIZE),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=column_types or {},
+                    strings_can_be_null=True
+                )
+            )
+            
+            for batch in reader:
+                for offset in range(0, batch.num_rows, self.chunk_size):
+                    chunk = batch.slice(offset, self.chunk_size).to_pandas()
+                    rows_read += len(chunk)
+                    yield chunk
+        except pa.ArrowInvalid as e:
+            # Un bloque posterior no encaja con los tipos del primero: pandas continúa
+            # desde el primer registro no entregado, infiriendo tipos por chunk
+            self.logger.warning(f"Lector CSV de PyArrow abandonado en la fila {rows_read}: {str(e)}")
+            yield from self._skip_records(pd.read_csv(file_path, chunksize=self.chunk_size), rows_read)
+    
+    @staticmethod
+    def _skip_records(chunks, count: int):
+        """Descartar los primeros count registros de un iterador de chunks
+        
+        skiprows cuenta líneas físicas y un campo entre comillas puede contener saltos de línea,
+        así que se relee desde el principio y se descartan registros ya parseados.
+        """
+        for chunk in chunks:
+            if count >= len(chunk):
+                count -= len(chunk)
+                continue
+            if count:
+                chunk = chunk.iloc[count:]
+                count = 0
+            yield chunk
+    
+    def _get_source_column_types(self, config: Dict) -> Optional[Dict]:
+        """Derivar tipos Arrow de las columnas del CSV a partir de la tabla destino"""
+        if not self.use_arrow_csv:
+            return None
+        
+        type_map = {
+            'smallint': pa.int64(),
+            'integer': pa.int64(),
+            'bigint': pa.int64(),
+            'real': pa.float64(),
+            'double precision': pa.float64(),
+            'boolean': pa.bool_(),
+            'date': pa.date32(),
+            'timestamp without time zone': pa.timestamp('us'),
+            'text': pa.string(),
+            'character varying': pa.string(),
+            'character': pa.string()
+        }
+        
+        schema_name, _, table_name = config['target_table'].rpartition('.')
+        conn = BaseModel.get_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT column_name, data_type
+                FROM information_schema.columns
+                WHERE table_name = %s AND table_schema = COALESCE(%s, current_schema())
+            """, (table_name, schema_name or None))
+            target_types = dict(cursor.fetchall())
+        finally:
+            cursor.close()
+            conn.close()
+        
+        # Columnas origen -> destino; las columnas transformadas conservan la inferencia
+        mapping = config.get('column_mapping') or {col: col for col in target_types}
+        transformed = set(config.get('transformations') or {})
+        
+        column_types = {}
+        for source_col, target_col in mapping.items():
+            arrow_type = type_map.get(target_types.get(target_col))
+            if arrow_type is not None and source_col not in transformed:
+                column_types[source_col] = arrow_type
+        
+        return column_types
+    
+    def _prefetch_chunks(self, chunks, maxsize: int = 2):
+        """Leer chunks en un hilo productor mientras el consumidor escribe en la base de datos"""
+        buffer = queue.Queue(maxsize=maxsize)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # Reintentar con timeout para no quedar bloqueado si el consumidor abandona
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for chunk in chunks:
+                    if not put(("chunk", chunk)):
+                        return
+                put(("done", None))
+            except Exception as e:
+                put(("error", e))
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        
+        try:
+            while True:
+                kind, item = buffer.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise item
+                yield item
+        finally:
+            stop.set()
     
-    def _process_chunk(self, chunk: pd.DataFrame, config: Dict, chunk_num: int) -> Dict:
+    def _process_chunk(self, chunk: pd.DataFrame, config: Dict, chunk_num: int, conn) -> Dict:
         """Procesar un chunk de datos"""
         try:
             # 1. Validar datos
@@ -122,7 +353,8 @@ class DataProcessor:
             processed_chunk = self._process_chunk_by_mode(
                 chunk,
                 config['target_table'],
-                config.get('mode', 'insert')
+                config.get('mode', 'insert'),
+                conn
             )
             
             return {
@@ -141,43 +373,49 @@ class DataProcessor:
     
     def _apply_column_mapping(self, df: pd.DataFrame, mapping: Dict) -> pd.DataFrame:
         """Aplicar mapeo de columnas al DataFrame"""
-        # Crear nuevo DataFrame con columnas mapeadas
-        mapped_df = pd.DataFrame()
-        
-        for source_col, target_col in mapping.items():
-            if source_col in df.columns:
-                mapped_df[target_col] = df[source_col]
-            else:
+        for source_col in mapping:
+            if source_col not in df.columns:
                 self.logger.warning(f"Columna origen '{source_col}' no encontrada")
         
+        present = {source: target for source, target in mapping.items() if source in df.columns}
+        
+        # Una sola selección y renombrado de etiquetas en lugar de insertar columna a columna
+        mapped_df = df[list(present)]
+        mapped_df.columns = list(present.values())
+        
         return mapped_df
     
-    def _process_chunk_by_mode(self, chunk: pd.DataFrame, table: str, mode: str) -> Dict:
+    def _process_chunk_by_mode(self, chunk: pd.DataFrame, table: str, mode: str, conn) -> Dict:
         """Procesar chunk según el modo especificado"""
-        from models.base import BaseModel
+        if mode == 'insert' and self.use_adbc:
+            return self._ingest_arrow_chunk(chunk, table)
         
         processed = 0
         errors = 0
+        cursor = conn.cursor()
         
         try:
-            conn = BaseModel.get_connection()
-            cursor = conn.cursor()
-            
-            if mode == 'insert':
+            if mode == 'insert' and self.use_copy:
+                # Carga masiva con COPY FROM STDIN
+                processed = self._copy_chunk(cursor, chunk, table)
+                
+            elif mode == 'insert':
                 # Inserción en lote
                 columns = chunk.columns.tolist()
-                values = [tuple(x) for x in chunk.values]
+                # Generador de tuplas leído columna a columna; sin lista intermedia
+                values = chunk.itertuples(index=False, name=None)
                 
-                placeholders = ','.join(['%s'] * len(columns))
                 columns_str = ','.join([f'"{col}"' for col in columns])
                 
                 query = f"""
                     INSERT INTO {table} ({columns_str})
-                    VALUES ({placeholders})
+                    VALUES %s
                 """
                 
-                cursor.executemany(query, values)
-                processed = cursor.rowcount
+                # Una sentencia INSERT multi-fila por página en lugar de un round-trip por fila
+                execute_values(cursor, query, values, page_size=min(1000, max(len(chunk), 1)))
+                # rowcount solo refleja la última página; si no hubo excepción se insertó todo
+                processed = len(chunk)
                 
             elif mode in ['update', 'sync']:
                 # Actualización/sincronización basada en clave primaria
@@ -186,16 +424,13 @@ class DataProcessor:
                 if not key_columns:
                     raise ValueError(f"No se encontró clave primaria para tabla {table}")
                 
-                for _, row in chunk.iterrows():
-                    try:
-                        if mode == 'update':
-                            self._update_record(cursor, table, row, key_columns)
-                        else:  # sync
-                            self._sync_record(cursor, table, row, key_columns)
-                        processed += 1
-                    except Exception as e:
-                        self.logger.error(f"Error procesando fila: {e}")
-                        errors += 1
+                if self.use_copy:
+                    # Carga en tabla temporal y una sola sentencia set-based
+                    processed, errors = self._merge_chunk_or_rows(cursor, chunk, table, mode, key_columns)
+                elif mode == 'update':
+                    processed, errors = self._update_rows(cursor, chunk, table, key_columns)
+                else:  # sync
+                    processed, errors = self._sync_rows(cursor, chunk, table, key_columns)
             
             conn.commit()
             
@@ -206,15 +441,152 @@ class DataProcessor:
             
         finally:
             cursor.close()
-            conn.close()
         
         return {
             "processed": processed,
             "errors": errors
         }
     
+    def _get_adbc_connection(self):
+        """Obtener (o abrir) la conexión ADBC del hilo actual"""
+        conn = getattr(self._adbc_local, 'conn', None)
+        if conn is None:
+            uri = "postgresql://{user}:{password}@{host}:{port}/{database}".format(
+                user=quote(str(DATABASE_CONFIG['user']), safe=''),
+                password=quote(str(DATABASE_CONFIG['password']), safe=''),
+                host=DATABASE_CONFIG['host'],
+                port=DATABASE_CONFIG['port'],
+                database=DATABASE_CONFIG['database']
+            )
+            conn = adbc.connect(uri)
+            self._adbc_local.conn = conn
+            self._adbc_connections.append(conn)
+        
+        return conn
+    
+    def _ingest_arrow_chunk(self, chunk: pd.DataFrame, table: str) -> Dict:
+        """Insertar un chunk con COPY binario desde memoria Arrow (ADBC)"""
+        conn = self._get_adbc_connection()
+        schema_name, _, table_name = table.rpartition('.')
+        
+        try:
+            with conn.cursor() as cursor:
+                inserted = cursor.adbc_ingest(
+                    table_name,
+                    pa.Table.from_pandas(chunk, preserve_index=False),
+                    mode='append',
+                    db_schema_name=schema_name or None
+                )
+            conn.commit()
+            
+            return {
+                "processed": inserted if inserted >= 0 else len(chunk),
+                "errors": 0
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error en ingesta ADBC: {e}")
+            conn.rollback()
+            return {
+                "processed": 0,
+                "errors": len(chunk)
+            }
+    
+    def _copy_chunk(self, cursor, chunk: pd.DataFrame, table: str) -> int:
+        """Cargar un chunk completo mediante COPY FROM STDIN en formato CSV"""
+        # Columnas enteras con nulos llegan como float ('30.0'), que COPY rechaza en columnas INTEGER
+        for col in chunk.select_dtypes(include='float').columns:
+            values = chunk[col].dropna()
+            if not values.empty and (values % 1 == 0).all():
+                chunk = chunk.assign(**{col: chunk[col].astype('Int64')})
+        
+        buffer = io.StringIO()
+        chunk.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
+        
+        columns_str = ','.join([f'"{col}"' for col in chunk.columns])
+        cursor.copy_expert(
+            f"COPY {table} ({columns_str}) FROM STDIN WITH (FORMAT CSV, NULL '\\N')",
+            buffer
+        )
+        
+        # copy_expert no informa rowcount de forma fiable
+        return len(chunk)
+    
+    def _merge_chunk(self, cursor, chunk: pd.DataFrame, table: str, mode: str,
+                     key_columns: List[str]) -> int:
+        """Actualizar o sincronizar un chunk desde una tabla temporal cargada con COPY"""
+        if any(key not in chunk.columns for key in key_columns):
+            raise ValueError("No se encontraron valores para columnas clave")
+        
+        columns = chunk.columns.tolist()
+        set_columns = [col for col in columns if col not in key_columns]
+        columns_str = ','.join([f'"{col}"' for col in columns])
+        keys_str = ','.join([f'"{key}"' for key in key_columns])
+        
+        # Solo las columnas del chunk, con los tipos de la tabla destino y sin restricciones
+        cursor.execute(f"""
+            CREATE TEMP TABLE _etl_staging ON COMMIT DROP AS
+            SELECT {columns_str} FROM {table} WITH NO DATA
+        """)
+        self._copy_chunk(cursor, chunk, '_etl_staging')
+        
+        if mode == 'update':
+            if not set_columns:
+                return 0
+            
+            set_str = ', '.join([f'"{col}" = s."{col}"' for col in set_columns])
+            where_str = ' AND '.join([f't."{key}" = s."{key}"' for key in key_columns])
+            # Con la misma clave dos veces UPDATE ... FROM elegiría una fila cualquiera: prevalece la última
+            cursor.execute(f"""
+                UPDATE {table} AS t
+                SET {set_str}
+                FROM (
+                    SELECT DISTINCT ON ({keys_str}) {columns_str}
+                    FROM _etl_staging
+                    ORDER BY {keys_str}, ctid DESC
+                ) AS s
+                WHERE {where_str}
+            """)
+        else:  # sync
+            if set_columns:
+                action = 'DO UPDATE SET ' + ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in set_columns])
+            else:
+                action = 'DO NOTHING'
+            
+            # ON CONFLICT no admite la misma clave dos veces: prevalece la última fila del chunk
+            cursor.execute(f"""
+                INSERT INTO {table} ({columns_str})
+                SELECT DISTINCT ON ({keys_str}) {columns_str}
+                FROM _etl_staging
+                ORDER BY {keys_str}, ctid DESC
+                ON CONFLICT ({keys_str}) {action}
+            """)
+        
+        return cursor.rowcount
+    
+    def _merge_chunk_or_rows(self, cursor, chunk: pd.DataFrame, table: str, mode: str,
+                             key_columns: List[str]) -> Tuple[int, int]:
+        """Aplicar el chunk con la carga set-based y, si falla, por lotes y filas con SAVEPOINT"""
+        cursor.execute("SAVEPOINT etl_merge")
+        try:
+            processed = self._merge_chunk(cursor, chunk, table, mode, key_columns)
+            cursor.execute("RELEASE SAVEPOINT etl_merge")
+            return processed, 0
+        except Exception as e:
+            # Deshace también la tabla temporal; solo las filas que fallan se descartan
+            cursor.execute("ROLLBACK TO SAVEPOINT etl_merge")
+            self.logger.error(f"Error en carga set-based del chunk, reintentando por lotes: {e}")
+        
+        if mode == 'update':
+            return self._update_rows(cursor, chunk, table, key_columns)
+        return self._sync_rows(cursor, chunk, table, key_columns)
+    
     def _get_primary_key_columns(self, cursor, table: str) -> List[str]:
         """Obtener columnas de clave primaria de una tabla"""
+        if table in self._pk_cache:
+            return self._pk_cache[table]
+        
         cursor.execute("""
             SELECT a.attname
             FROM pg_index i
@@ -222,74 +594,132 @@ class DataProcessor:
             WHERE i.indrelid = %s::regclass AND i.indisprimary
         """, (table,))
         
-        return [row[0] for row in cursor.fetchall()]
+        key_columns = [row[0] for row in cursor.fetchall()]
+        self._pk_cache[table] = key_columns
+        return key_columns
+    
+    @staticmethod
+    def _make_packer(indexes: List[int]) -> Callable:
+        """Crear una función que extrae por posición los valores indicados de una fila"""
+        if len(indexes) == 1:
+            index = indexes[0]
+            return lambda row: (row[index],)
+        return itemgetter(*indexes)
     
-    def _update_record(self, cursor, table: str, row: pd.Series, key_columns: List[str]):
-        """Actualizar un registro existente"""
-        # Construir condición WHERE basada en clave primaria
-        where_conditions = []
-        where_values = []
-        
-        for key in key_columns:
-            if key in row:
-                where_conditions.append(f'"{key}" = %s')
-                where_values.append(row[key])
-        
-        if not where_conditions:
+    def _build_row_statements(self, table: str, columns: List[str], key_columns: List[str]) -> Dict:
+        """Construir una sola vez por carga las sentencias por fila y sus empaquetadores"""
+        cache_key = (table, tuple(columns), tuple(key_columns))
+        if cache_key in self._statement_cache:
+            return self._statement_cache[cache_key]
+        
+        if any(key not in columns for key in key_columns):
             raise ValueError("No se encontraron valores para columnas clave")
         
-        # Construir SET para columnas no clave
-        set_items = []
-        set_values = []
+        set_columns = [col for col in columns if col not in key_columns]
+        columns_str = ','.join([f'"{col}"' for col in columns])
+        keys_str = ','.join([f'"{key}"' for key in key_columns])
+        placeholders = ','.join(['%s'] * len(columns))
         
-        for col in row.index:
-            if col not in key_columns:
-                set_items.append(f'"{col}" = %s')
-                set_values.append(row[col])
+        update_sql = None
+        if set_columns:
+            update_sql = f"""
+                UPDATE {table}
+                SET {', '.join([f'"{col}" = %s' for col in set_columns])}
+                WHERE {' AND '.join([f'"{key}" = %s' for key in key_columns])}
+            """
+            conflict_action = 'DO UPDATE SET ' + ', '.join([f'"{col}" = EXCLUDED."{col}"' for col in set_columns])
+        else:
+            conflict_action = 'DO NOTHING'
         
-        # Construir y ejecutar query
-        query = f"""
-            UPDATE {table}
-            SET {', '.join(set_items)}
-            WHERE {' AND '.join(where_conditions)}
-        """
+        set_idx = [columns.index(col) for col in set_columns]
+        key_idx = [columns.index(key) for key in key_columns]
         
-        cursor.execute(query, set_values + where_values)
+        statements = {
+            "update": update_sql,
+            # Una sola sentencia por fila: el conflicto se resuelve en el servidor con el índice de la PK
+            "upsert": f"""
+                INSERT INTO {table} ({columns_str})
+                VALUES ({placeholders})
+                ON CONFLICT ({keys_str}) {conflict_action}
+            """,
+            # Valores SET seguidos de los valores clave, en el orden de update_sql
+            "pack_update": self._make_packer(set_idx + key_idx) if set_columns else None
+        }
+        self._statement_cache[cache_key] = statements
+        return statements
     
-    def _sync_record(self, cursor, table: str, row: pd.Series, key_columns: List[str]):
-        """Sincronizar un registro (actualizar si existe, insertar si no)"""
-        # Verificar si el registro existe
-        where_conditions = []
-        where_values = []
+    def _apply_in_savepoints(self, cursor, rows, apply_batch: Callable,
+                             batch_size: int = 100) -> Tuple[int, int]:
+        """Aplicar filas en sub-lotes, cada uno protegido por un SAVEPOINT"""
+        processed = 0
+        errors = 0
+        rows = iter(rows)
         
-        for key in key_columns:
-            if key in row:
-                where_conditions.append(f'"{key}" = %s')
-                where_values.append(row[key])
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            
+            cursor.execute("SAVEPOINT etl_batch")
+            try:
+                apply_batch(batch)
+                cursor.execute("RELEASE SAVEPOINT etl_batch")
+                processed += len(batch)
+                continue
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT etl_batch")
+                self.logger.error(f"Error en lote de filas, reintentando fila a fila: {e}")
+            
+            # Solo las filas que fallan se descartan; el resto del lote se conserva
+            for row in batch:
+                cursor.execute("SAVEPOINT etl_row")
+                try:
+                    apply_batch([row])
+                    cursor.execute("RELEASE SAVEPOINT etl_row")
+                    processed += 1
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO SAVEPOINT etl_row")
+                    self.logger.error(f"Error procesando fila: {e}")
+                    errors += 1
         
-        cursor.execute(f"""
-            SELECT 1 FROM {table}
-            WHERE {' AND '.join(where_conditions)}
-        """, where_values)
+        return processed, errors
+    
+    def _update_rows(self, cursor, chunk: pd.DataFrame, table: str,
+                     key_columns: List[str]) -> Tuple[int, int]:
+        """Actualizar las filas del chunk enviando los UPDATE en lotes de 100"""
+        statements = self._build_row_statements(table, chunk.columns.tolist(), key_columns)
+        if not statements["update"]:
+            return 0, 0
         
-        exists = cursor.fetchone() is not None
+        def apply_batch(batch: List[Tuple]):
+            # execute_batch agrupa varias sentencias por round-trip al servidor
+            execute_batch(cursor, statements["update"], map(statements["pack_update"], batch), page_size=100)
         
-        if exists:
-            self._update_record(cursor, table, row, key_columns)
-        else:
-            columns = row.index.tolist()
-            values = row.values.tolist()
-            placeholders = ','.join(['%s'] * len(columns))
-            columns_str = ','.join([f'"{col}"' for col in columns])
-            
-            cursor.execute(f"""
-                INSERT INTO {table} ({columns_str})
-                VALUES ({placeholders})
-            """, values)
+        # Tuplas de escalares Python leídas por columna; sin consolidar el chunk a un ndarray object
+        rows = chunk.itertuples(index=False, name=None)
+        return self._apply_in_savepoints(cursor, rows, apply_batch)
     
-    def _update_progress(self, processed: int, total: int):
+    def _sync_rows(self, cursor, chunk: pd.DataFrame, table: str,
+                   key_columns: List[str]) -> Tuple[int, int]:
+        """Sincronizar las filas del chunk (actualizar si existe, insertar si no) en lotes de 100"""
+        statements = self._build_row_statements(table, chunk.columns.tolist(), key_columns)
+        
+        def apply_batch(batch: List[Tuple]):
+            execute_batch(cursor, statements["upsert"], batch, page_size=100)
+        
+        rows = chunk.itertuples(index=False, name=None)
+        return self._apply_in_savepoints(cursor, rows, apply_batch)
+    
+    def _update_progress(self, processed: int, total: int, final: bool = False):
         """Actualizar progreso del procesamiento"""
         if self.load_history:
+            # Como máximo un mensaje cada 0.5 s; el formateo y la E/S del log dominan en cargas rápidas.
+            # El progreso final, tras el último chunk, se registra siempre
+            now = time.monotonic()
+            if not final and now - self._last_progress_log < 0.5:
+                return
+            self._last_progress_log = now
+            
             progress = round((processed / max(total, 1)) * 100, 2)
             self.logger.info(f"Progreso: {progress}% ({processed}/{total} filas)")
     
@@ -4,59 +4,304 @@ Módulo de transformaciones de datos para ETL
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator
 from datetime import datetime
 import re
 import ast
+import os
 import sys
+import time
 from io import StringIO
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pandas.api.types import is_numeric_dtype, is_bool_dtype
 import logging
 
+# Importación opcional de PyArrow para cadenas respaldadas por Arrow
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Importación opcional de numexpr para evaluar condiciones numéricas
+try:
+    import numexpr
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+# Importación opcional de Numba para operaciones matemáticas en paralelo
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Patrón de espacios repetidos, compilado una sola vez
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Tabla de traducción de caracteres acentuados a su forma sin acento
+_ACCENT_TABLE = str.maketrans({
+    'á': 'a', 'à': 'a', 'ä': 'a', 'â': 'a', 'ā': 'a', 'ã': 'a',
+    'é': 'e', 'è': 'e', 'ë': 'e', 'ê': 'e', 'ē': 'e',
+    'í': 'i', 'ì': 'i', 'ï': 'i', 'î': 'i', 'ī': 'i',
+    'ó': 'o', 'ò': 'o', 'ö': 'o', 'ô': 'o', 'ō': 'o', 'õ': 'o',
+    'ú': 'u', 'ù': 'u', 'ü': 'u', 'û': 'u', 'ū': 'u',
+    'ñ': 'n', 'ç': 'c',
+    'Á': 'A', 'À': 'A', 'Ä': 'A', 'Â': 'A', 'Ā': 'A', 'Ã': 'A',
+    'É': 'E', 'È': 'E', 'Ë': 'E', 'Ê': 'E', 'Ē': 'E',
+    'Í': 'I', 'Ì': 'I', 'Ï': 'I', 'Î': 'I', 'Ī': 'I',
+    'Ó': 'O', 'Ò': 'O', 'Ö': 'O', 'Ô': 'O', 'Ō': 'O', 'Õ': 'O',
+    'Ú': 'U', 'Ù': 'U', 'Ü': 'U', 'Û': 'U', 'Ū': 'U',
+    'Ñ': 'N', 'Ç': 'C'
+})
+
+
+# Máximo de entradas conservadas en el historial de transformaciones
+_HISTORY_MAX_ENTRIES = 10000
+
+# Formatos de fecha que NumPy genera directamente, según la unidad a la que se trunca
+_NUMPY_DATE_UNITS = {
+    '%Y-%m-%d': 'D',
+    '%Y-%m-%dT%H:%M:%S': 's',
+    'iso': 's'
+}
+
+# Códigos de operación del kernel Numba y tamaño mínimo a partir del cual compensa usarlo
+_NUMBA_OPERATIONS = {
+    'add': 0,
+    'subtract': 1,
+    'multiply': 2,
+    'divide': 3,
+    'power': 4,
+    'sqrt': 5,
+    'log': 6,
+    'log10': 7,
+    'abs': 8
+}
+_NUMBA_MIN_ROWS = 100000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _arithmetic_kernel(values, operand, op_code):
+        """Aplicar una operación aritmética sobre un array float64 repartiendo el bucle entre núcleos"""
+        result = np.empty_like(values)
+        for i in prange(values.shape[0]):
+            x = values[i]
+            if op_code == 0:
+                result[i] = x + operand
+            elif op_code == 1:
+                result[i] = x - operand
+            elif op_code == 2:
+                result[i] = x * operand
+            elif op_code == 3:
+                result[i] = x / operand
+            elif op_code == 4:
+                result[i] = x ** operand
+            elif op_code == 5:
+                result[i] = np.sqrt(x)
+            elif op_code == 6:
+                result[i] = np.log(x)
+            elif op_code == 7:
+                result[i] = np.log10(x)
+            else:
+                result[i] = abs(x)
+        return result
+
+# Transformaciones de caso por cadena
+_CASE_METHODS = {
+    'upper': str.upper,
+    'lower': str.lower,
+    'title': str.title,
+    'capitalize': str.capitalize,
+    'trim': str.strip
+}
+
+# Umbrales para transformar texto sobre los valores únicos en lugar de fila por fila
+_CATEGORICAL_MIN_ROWS = 1000
+_CATEGORICAL_MAX_RATIO = 0.01
+
+# Palabras/módulos prohibidos por seguridad en el código personalizado
+_FORBIDDEN_KEYWORDS = [
+    'import os', 'import sys', 'import subprocess', 'import socket',
+    'import urllib', 'import requests', 'import http', 'import ftplib',
+    'import smtplib', 'import telnetlib', 'import pickle', 'import marshal',
+    'import ctypes', 'import threading', 'import multiprocessing',
+    'exec(', 'eval(', '__import__', 'open(', 'file(', 'input(',
+    'raw_input(', 'compile(', 'globals(', 'locals(', 'vars(',
+    'dir(', 'hasattr(', 'getattr(', 'setattr(', 'delattr('
+]
+
+# Alternancia compilada: el código se recorre una sola vez sin importar cuántas palabras haya
+_FORBIDDEN_RE = re.compile('|'.join(re.escape(keyword) for keyword in _FORBIDDEN_KEYWORDS))
+
+# Funciones permitidas dentro del código personalizado
+_SAFE_BUILTINS = {
+    'len': len,
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+    'tuple': tuple,
+    'set': set,
+    'min': min,
+    'max': max,
+    'sum': sum,
+    'abs': abs,
+    'round': round,
+    'range': range,
+    'enumerate': enumerate,
+    'zip': zip,
+    'map': map,
+    'filter': filter,
+    'sorted': sorted,
+    'reversed': reversed
+}
+
+
+@lru_cache(maxsize=512)
+def _compile_regex(pattern: str, flags: int = 0):
+    """Compilar una expresión regular reutilizando la versión en caché"""
+    return re.compile(pattern, flags)
+
+
+# Condiciones que se pueden delegar a numexpr: solo nombres, números, comparaciones y operadores
+_NUMEXPR_SAFE_RE = re.compile(r'^[\w\s.()<>=!&|~+\-*/%]+$')
+
+
+@lru_cache(maxsize=512)
+def _build_replace_pattern(replace_from: str):
+    """Compilar el patrón de un reemplazo literal sin distinguir mayúsculas, reutilizando la versión en caché"""
+    return re.compile(re.escape(replace_from), re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _compile_condition(condition_expr: str):
+    """Compilar una condición, reemplazando 'value' por la serie actual, reutilizando la versión en caché"""
+    return compile(condition_expr.replace('value', 'series'), '<cond>', 'eval')
+
+
+def _to_bool_mask(mask) -> np.ndarray:
+    """Convertir el resultado de una condición a booleanos; los nulos (condición desconocida) no se cumplen"""
+    values = np.asarray(mask)
+    if values.dtype == bool:
+        return values
+    values = np.asarray(mask, dtype=object)
+    return np.where(pd.isna(values), False, values).astype(bool)
+
+
+def _copy_on_write_enabled() -> bool:
+    """Indicar si pandas usa Copy-on-Write (siempre desde pandas 3, opcional con mode.copy_on_write en pandas 2)"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        # pandas < 2 no tiene la opción
+        return False
+
 
 class DataTransformer:
     """Transformador de datos con soporte para transformaciones personalizadas"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, use_arrow_strings: bool = False, record_history: bool = True):
         self.session_id = session_id
+        # Con cadenas Arrow los nulos se conservan como <NA> en lugar de convertirse en 'nan'
+        self.use_arrow_strings = use_arrow_strings and PYARROW_AVAILABLE
+        self._text_dtype = 'string[pyarrow]' if self.use_arrow_strings else str
         self.custom_transformations = {}
-        self.transformation_history = []
+        # Historial acotado de tuplas (columna, configuración, time.time(), estado, error);
+        # se convierte a diccionarios solo al consultarlo
+        self.record_history = record_history
+        self.transformation_history = deque(maxlen=_HISTORY_MAX_ENTRIES)
+        # Código personalizado ya compilado, por texto del código
+        self._compiled_custom = {}
+        # Tabla de despacho por tipo de transformación
+        self._dispatch = {
+            'date': self._transform_date_column,
+            'number': self._transform_number_column,
+            'text': self._transform_text_column,
+            'replace': self._transform_replace_column,
+            'custom': self._transform_custom_column,
+            'conditional': self._transform_conditional_column,
+            'regex': self._transform_regex_column,
+            'mathematical': self._transform_mathematical_column
+        }
         self.logger = logging.getLogger(__name__)
     
-    def apply_transformations(self, df: pd.DataFrame, transformations: Dict) -> pd.DataFrame:
+    def apply_transformations(self, df: pd.DataFrame, transformations: Dict, parallel: bool = False) -> pd.DataFrame:
         """Aplicar todas las transformaciones al DataFrame"""
-        df_transformed = df.copy()
+        # Con Copy-on-Write basta una copia superficial: cada transformación reemplaza la columna
+        # completa y no puede escribir en los datos del llamador. Sin él, pandas 1.x puede asignar
+        # una columna del mismo dtype dentro del bloque compartido, así que se copia en profundidad
+        df_transformed = df.copy(deep=not _copy_on_write_enabled())
         
+        pending = []
         for column, transform_config in transformations.items():
             if column not in df_transformed.columns:
                 self.logger.warning(f"Columna '{column}' no encontrada en el DataFrame")
                 continue
-            
-            try:
-                df_transformed[column] = self._apply_single_transformation(
-                    df_transformed[column], 
-                    transform_config
-                )
+            pending.append((column, transform_config))
+        
+        # Las columnas son independientes; con parallel=True se transforman en un pool de hilos
+        if parallel and len(pending) > 1:
+            outcomes = self._transform_columns_parallel(df_transformed, pending)
+        else:
+            outcomes = (self._transform_column(df_transformed[column], transform_config)
+                        for column, transform_config in pending)
+        
+        for (column, transform_config), (result, error) in zip(pending, outcomes):
+            if error is None:
+                df_transformed[column] = result
                 
                 # Registrar transformación aplicada
-                self.transformation_history.append({
-                    "column": column,
-                    "transformation": transform_config,
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "success"
-                })
-                
-            except Exception as e:
-                self.logger.error(f"Error transformando columna '{column}': {e}")
-                self.transformation_history.append({
-                    "column": column,
-                    "transformation": transform_config,
-                    "timestamp": datetime.now().isoformat(),
-                    "status": "error",
-                    "error": str(e)
-                })
+                if self.record_history:
+                    self.transformation_history.append((column, transform_config, time.time(), "success", None))
+            else:
+                self.logger.error(f"Error transformando columna '{column}': {error}")
+                if self.record_history:
+                    self.transformation_history.append((column, transform_config, time.time(), "error", str(error)))
         
         return df_transformed
     
+    def apply_transformations_chunked(self, chunks: Iterable[pd.DataFrame], transformations: Dict,
+                                      parallel: bool = False) -> Iterator[pd.DataFrame]:
+        """Aplicar las transformaciones chunk a chunk (por ejemplo, de pd.read_csv con chunksize)"""
+        # Solo un chunk transformado vive en memoria a la vez; las cachés de regex,
+        # condiciones y código personalizado se comparten entre chunks
+        for chunk in chunks:
+            yield self.apply_transformations(chunk, transformations, parallel=parallel)
+    
+    def _transform_column(self, series: pd.Series, transform_config: Dict):
+        """Transformar una columna devolviendo (resultado, error)"""
+        try:
+            return self._apply_single_transformation(series, transform_config), None
+        except Exception as e:
+            return None, e
+    
+    def _transform_columns_parallel(self, df: pd.DataFrame, pending: List) -> List:
+        """Transformar varias columnas en paralelo, en el mismo orden que pending"""
+        max_workers = min(os.cpu_count() or 1, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # El código personalizado es Python puro y no escala con hilos por el GIL:
+            # se ejecuta en este hilo mientras el pool avanza con el resto
+            futures = [
+                None if transform_config.get('type') == 'custom'
+                else executor.submit(self._transform_column, df[column], transform_config)
+                for column, transform_config in pending
+            ]
+            serial = {
+                index: self._transform_column(df[column], transform_config)
+                for index, ((column, transform_config), future) in enumerate(zip(pending, futures))
+                if future is None
+            }
+            return [serial[index] if future is None else future.result() for index, future in enumerate(futures)]
+    
     def get_custom_transformation_by_name(self, name: str):
         """Obtener transformación personalizada por nombre"""
         from models.transformation import ETLCustomTransformation
@@ -68,25 +313,12 @@ class DataTransformer:
         transform_type = transform_config.get('type')
         options = transform_config.get('options', {})
         
-        if transform_type == 'date':
-            return self._transform_date_column(series, options)
-        elif transform_type == 'number':
-            return self._transform_number_column(series, options)
-        elif transform_type == 'text':
-            return self._transform_text_column(series, options)
-        elif transform_type == 'replace':
-            return self._transform_replace_column(series, options)
-        elif transform_type == 'custom':
-            return self._transform_custom_column(series, options)
-        elif transform_type == 'conditional':
-            return self._transform_conditional_column(series, options)
-        elif transform_type == 'regex':
-            return self._transform_regex_column(series, options)
-        elif transform_type == 'mathematical':
-            return self._transform_mathematical_column(series, options)
-        else:
+        transform_function = self._dispatch.get(transform_type)
+        if transform_function is None:
             self.logger.warning(f"Tipo de transformación desconocido: {transform_type}")
             return series
+        
+        return transform_function(series, options)
     
     def _transform_date_column(self, series: pd.Series, options: Dict) -> pd.Series:
         """Transformar columna de fechas"""
@@ -101,6 +333,17 @@ class DataTransformer:
             else:
                 parsed_dates = pd.to_datetime(series, format=date_format_from, errors=handle_errors)
             
+            # Fechas sin zona horaria: los formatos comunes se generan con NumPy en C,
+            # sin una llamada a strftime por valor
+            if isinstance(parsed_dates.dtype, np.dtype) and parsed_dates.dtype.kind == 'M':
+                fast_unit = _NUMPY_DATE_UNITS.get(date_format_to)
+                if date_format_to == 'timestamp':
+                    values = parsed_dates.to_numpy()
+                    seconds = values.astype('datetime64[s]').view('int64')  # Unix timestamp
+                    return pd.Series(pd.arrays.IntegerArray(seconds, np.isnat(values)), index=series.index, name=series.name)
+                elif fast_unit is not None:
+                    return self._format_datetime_values(parsed_dates, fast_unit)
+            
             # Formatear según el formato de salida
             if date_format_to == 'timestamp':
                 return parsed_dates.astype('int64') // 10**9  # Unix timestamp
@@ -113,6 +356,13 @@ class DataTransformer:
             self.logger.error(f"Error en transformación de fecha: {e}")
             return series
     
+    def _format_datetime_values(self, dates: pd.Series, unit: str) -> pd.Series:
+        """Formatear fechas con np.datetime_as_string, dejando NaN en lugar de NaT"""
+        values = dates.to_numpy().astype(f'datetime64[{unit}]')
+        formatted = np.datetime_as_string(values).astype(object)
+        formatted[np.isnat(values)] = np.nan
+        return pd.Series(formatted, index=dates.index, name=dates.name)
+    
     def _transform_number_column(self, series: pd.Series, options: Dict) -> pd.Series:
         """Transformar columna numérica"""
         decimal_separator = options.get('decimal_separator', '.')
@@ -120,18 +370,32 @@ class DataTransformer:
         round_decimals = options.get('round_decimals', None)
         fill_na = options.get('fill_na', None)
         
-        # Limpiar la serie
-        cleaned_series = series.astype(str)
-        
-        # Reemplazar separadores
-        if thousands_separator:
-            cleaned_series = cleaned_series.str.replace(thousands_separator, '')
-        
-        if decimal_separator != '.':
-            cleaned_series = cleaned_series.str.replace(decimal_separator, '.')
-        
-        # Convertir a numérico
-        numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
+        if is_numeric_dtype(series) and not is_bool_dtype(series):
+            # La columna ya es numérica: no hay separadores que limpiar
+            numeric_series = series
+        else:
+            # Limpiar la serie
+            cleaned_series = series.astype(str)
+            
+            # Reemplazar separadores
+            if len(thousands_separator) <= 1 and len(decimal_separator) == 1:
+                # Ambos separadores en una sola pasada con translate
+                replacements = {}
+                if thousands_separator:
+                    replacements[thousands_separator] = None
+                if decimal_separator != '.':
+                    replacements[decimal_separator] = '.'
+                if replacements:
+                    cleaned_series = cleaned_series.str.translate(str.maketrans(replacements))
+            else:
+                if thousands_separator:
+                    cleaned_series = cleaned_series.str.replace(thousands_separator, '', regex=False)
+                
+                if decimal_separator != '.':
+                    cleaned_series = cleaned_series.str.replace(decimal_separator, '.', regex=False)
+            
+            # Convertir a numérico
+            numeric_series = pd.to_numeric(cleaned_series, errors='coerce')
         
         # Rellenar valores nulos si se especifica
         if fill_na is not None:
@@ -149,29 +413,51 @@ class DataTransformer:
         remove_accents = options.get('remove_accents', False)
         remove_extra_spaces = options.get('remove_extra_spaces', True)
         
-        text_series = series.astype(str)
-        
-        # Aplicar transformación de caso
-        if text_transform == 'upper':
-            text_series = text_series.str.upper()
-        elif text_transform == 'lower':
-            text_series = text_series.str.lower()
-        elif text_transform == 'title':
-            text_series = text_series.str.title()
-        elif text_transform == 'capitalize':
-            text_series = text_series.str.capitalize()
-        elif text_transform == 'trim':
-            text_series = text_series.str.strip()
-        
-        # Remover acentos si se especifica
-        if remove_accents:
-            text_series = self._remove_accents(text_series)
-        
-        # Remover espacios extra
-        if remove_extra_spaces:
-            text_series = text_series.str.replace(r'\s+', ' ', regex=True).str.strip()
-        
-        return text_series
+        case_method = _CASE_METHODS.get(text_transform)
+        
+        def transform_value(value):
+            # Caso, acentos y espacios aplicados a cada cadena en una sola pasada
+            if not isinstance(value, str):
+                return value
+            if case_method is not None:
+                value = case_method(value)
+            if remove_accents:
+                value = value.translate(_ACCENT_TABLE)
+            if remove_extra_spaces:
+                value = _WHITESPACE_RE.sub(' ', value).strip()
+            return value
+        
+        def transform_text(text_series: pd.Series) -> pd.Series:
+            if not self.use_arrow_strings:
+                # Con cadenas de objetos cada paso .str recorre la columna en Python,
+                # así que se fusionan en un solo map
+                return text_series.map(transform_value)
+            
+            # Con cadenas Arrow cada paso usa un kernel nativo
+            # Aplicar transformación de caso
+            if text_transform == 'upper':
+                text_series = text_series.str.upper()
+            elif text_transform == 'lower':
+                text_series = text_series.str.lower()
+            elif text_transform == 'title':
+                text_series = text_series.str.title()
+            elif text_transform == 'capitalize':
+                text_series = text_series.str.capitalize()
+            elif text_transform == 'trim':
+                text_series = text_series.str.strip()
+            
+            # Remover acentos si se especifica
+            if remove_accents:
+                text_series = self._remove_accents(text_series)
+            
+            # Remover espacios extra
+            if remove_extra_spaces:
+                # El patrón como str: con un re.Pattern las cadenas Arrow caen a la ruta por elemento
+                text_series = text_series.str.replace(_WHITESPACE_RE.pattern, ' ', regex=True).str.strip()
+            
+            return text_series
+        
+        return self._maybe_categorical_fast(series, transform_text)
     
     def _transform_replace_column(self, series: pd.Series, options: Dict) -> pd.Series:
         """Reemplazar valores en columna"""
@@ -183,72 +469,62 @@ class DataTransformer:
         if not replace_from:
             return series
         
-        text_series = series.astype(str)
-        
-        if use_regex:
-            flags = 0 if case_sensitive else re.IGNORECASE
-            return text_series.str.replace(replace_from, replace_to, regex=True, flags=flags)
-        else:
-            if case_sensitive:
-                return text_series.str.replace(replace_from, replace_to)
+        def replace_text(text_series: pd.Series) -> pd.Series:
+            if use_regex:
+                flags = 0 if case_sensitive else re.IGNORECASE
+                return text_series.str.replace(_compile_regex(replace_from, flags), replace_to, regex=True)
             else:
-                # Para reemplazo sin regex y sin case sensitive
-                pattern = re.escape(replace_from)
-                return text_series.str.replace(pattern, replace_to, regex=True, flags=re.IGNORECASE)
+                if case_sensitive:
+                    # Reemplazo literal: str.replace de Python, sin pasar por el motor de regex
+                    return text_series.str.replace(replace_from, replace_to, regex=False)
+                else:
+                    # Para reemplazo sin regex y sin case sensitive; el reemplazo también es literal
+                    return text_series.str.replace(_build_replace_pattern(replace_from),
+                                                   replace_to.replace('\\', '\\\\'), regex=True)
+        
+        return self._maybe_categorical_fast(series, replace_text)
     
     def _transform_custom_column(self, series: pd.Series, options: Dict) -> pd.Series:
         """Aplicar transformación personalizada con código Python"""
         custom_code = options.get('code', '')
         function_name = options.get('function_name', 'transform')
         parameters = options.get('parameters', {})
+        # Con vectorized=True la función recibe la columna completa (ndarray) en una sola llamada
+        vectorized = options.get('vectorized', False)
         
         if not custom_code:
             self.logger.warning("No se proporcionó código personalizado")
             return series
         
         try:
-            # Crear un entorno seguro para ejecutar el código
+            # Compilar el código solo la primera vez
+            code = self._compiled_custom.get(custom_code)
+            if code is None:
+                code = compile(custom_code, '<string>', 'exec')
+                self._compiled_custom[custom_code] = code
+            
+            # Entorno seguro nuevo en cada llamada: la función lee 'parameters' como global y
+            # con chunks en paralelo dos llamadas no deben compartirlo
             safe_globals = {
-                '__builtins__': {
-                    'len': len,
-                    'str': str,
-                    'int': int,
-                    'float': float,
-                    'bool': bool,
-                    'list': list,
-                    'dict': dict,
-                    'tuple': tuple,
-                    'set': set,
-                    'min': min,
-                    'max': max,
-                    'sum': sum,
-                    'abs': abs,
-                    'round': round,
-                    'range': range,
-                    'enumerate': enumerate,
-                    'zip': zip,
-                    'map': map,
-                    'filter': filter,
-                    'sorted': sorted,
-                    'reversed': reversed
-                },
+                '__builtins__': dict(_SAFE_BUILTINS),
                 'pd': pd,
                 'np': np,
                 're': re,
                 'datetime': datetime,
                 'parameters': parameters
             }
-            
-            # Ejecutar el código personalizado
-            exec(custom_code, safe_globals)
+            exec(code, safe_globals)
             
             # Obtener la función de transformación
             if function_name in safe_globals:
                 transform_function = safe_globals[function_name]
                 
-                # Aplicar la función a cada valor de la serie
-                if callable(transform_function):
-                    return series.apply(transform_function)
+                if callable(transform_function) and vectorized:
+                    return pd.Series(transform_function(series.values), index=series.index)
+                elif callable(transform_function):
+                    # Aplicar la función a cada valor; frompyfunc itera en C sin el overhead de apply
+                    result = np.frompyfunc(transform_function, 1, 1)(series.to_numpy(dtype=object))
+                    return pd.Series(result, index=series.index).infer_objects()
                 else:
                     self.logger.error(f"'{function_name}' no es una función")
                     return series
@@ -265,8 +541,8 @@ class DataTransformer:
         conditions = options.get('conditions', [])
         default_value = options.get('default_value', None)
         
-        result = series.copy()
-        
+        masks = []
+        values = []
         for condition in conditions:
             condition_expr = condition.get('condition', '')
             value = condition.get('value', '')
@@ -274,10 +550,19 @@ class DataTransformer:
             try:
                 # Evaluar condición de forma segura
                 mask = self._evaluate_condition(series, condition_expr)
-                result.loc[mask] = value
+                masks.append(np.broadcast_to(_to_bool_mask(mask), len(series)))
+                values.append(value)
             except Exception as e:
                 self.logger.error(f"Error en condición '{condition_expr}': {e}")
         
+        if masks:
+            # Una sola selección vectorizada; se invierte el orden para que la última condición
+            # que se cumple tenga prioridad, igual que con las asignaciones sucesivas
+            selected = np.select(masks[::-1], values[::-1], default=series.to_numpy(dtype=object))
+            result = pd.Series(selected, index=series.index, name=series.name).infer_objects()
+        else:
+            result = series.copy()
+        
         # Aplicar valor por defecto si se especifica
         if default_value is not None:
             result = result.fillna(default_value)
@@ -294,15 +579,16 @@ class DataTransformer:
         if not pattern:
             return series
         
-        text_series = series.astype(str)
-        
-        try:
+        def regex_text(text_series: pd.Series) -> pd.Series:
             if extract_group is not None:
                 # Extraer grupo específico
-                return text_series.str.extract(pattern, flags=flags)[extract_group]
+                return text_series.str.extract(_compile_regex(pattern, flags))[extract_group]
             else:
                 # Reemplazar patrón
-                return text_series.str.replace(pattern, replacement, regex=True, flags=flags)
+                return text_series.str.replace(_compile_regex(pattern, flags), replacement, regex=True)
+        
+        try:
+            return self._maybe_categorical_fast(series, regex_text)
         except Exception as e:
             self.logger.error(f"Error en transformación regex: {e}")
             return series
@@ -313,63 +599,100 @@ class DataTransformer:
         operand = options.get('operand', 0)
         
         try:
-            numeric_series = pd.to_numeric(series, errors='coerce')
+            # Las columnas numéricas de NumPy se usan tal cual, sin pasar por to_numeric
+            if is_numeric_dtype(series) and isinstance(series.dtype, np.dtype):
+                values = series.to_numpy()
+            else:
+                numeric_series = pd.to_numeric(series, errors='coerce')
+                if isinstance(numeric_series.dtype, np.dtype):
+                    values = numeric_series.to_numpy()
+                else:
+                    # Tipos enteros con nulos (Int64): operar sobre float64 con NaN
+                    values = numeric_series.to_numpy(dtype='float64', na_value=np.nan)
             
+            # Columnas float64 grandes: kernel Numba compilado que reparte el bucle entre núcleos
+            op_code = _NUMBA_OPERATIONS.get(operation)
+            if (NUMBA_AVAILABLE and op_code is not None and values.dtype == np.float64
+                    and len(values) >= _NUMBA_MIN_ROWS and not (operation == 'divide' and operand == 0)):
+                result = _arithmetic_kernel(values, float(operand), op_code)
+                return pd.Series(result, index=series.index, name=series.name)
+            
+            # Operar directamente sobre el ndarray y envolver el resultado una sola vez
             if operation == 'add':
-                return numeric_series + operand
+                result = values + operand
             elif operation == 'subtract':
-                return numeric_series - operand
+                result = values - operand
             elif operation == 'multiply':
-                return numeric_series * operand
+                result = values * operand
             elif operation == 'divide':
-                return numeric_series / operand if operand != 0 else numeric_series
+                result = values / operand if operand != 0 else values
             elif operation == 'power':
-                return numeric_series ** operand
+                result = values ** operand
             elif operation == 'sqrt':
-                return np.sqrt(numeric_series)
+                result = np.sqrt(values)
             elif operation == 'log':
-                return np.log(numeric_series)
+                result = np.log(values)
             elif operation == 'log10':
-                return np.log10(numeric_series)
+                result = np.log10(values)
             elif operation == 'abs':
-                return np.abs(numeric_series)
+                result = np.abs(values)
             elif operation == 'round':
-                return np.round(numeric_series, int(operand))
+                result = np.round(values, int(operand))
             else:
                 self.logger.warning(f"Operación matemática desconocida: {operation}")
                 return series
+            
+            return pd.Series(result, index=series.index, name=series.name)
                 
         except Exception as e:
             self.logger.error(f"Error en transformación matemática: {e}")
             return series
     
+    def _maybe_categorical_fast(self, series: pd.Series, op: Callable[[pd.Series], pd.Series]) -> pd.Series:
+        """Aplicar una operación de texto solo sobre los valores únicos si la columna tiene baja cardinalidad"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            uniques = series.cat.categories.astype(self._text_dtype)
+        else:
+            text_series = series.astype(self._text_dtype)
+            if len(text_series) < _CATEGORICAL_MIN_ROWS:
+                return op(text_series)
+            
+            codes, uniques = pd.factorize(text_series, sort=False)
+            if len(uniques) > len(text_series) * _CATEGORICAL_MAX_RATIO:
+                return op(text_series)
+        
+        uniques = np.asarray(uniques, dtype=object)
+        if (codes < 0).any():
+            # Los nulos se convierten igual que en el camino fila por fila
+            codes = np.where(codes < 0, len(uniques), codes)
+            uniques = np.append(uniques, pd.Series([np.nan]).astype(self._text_dtype).iloc[0])
+        
+        # Transformar cada valor distinto una sola vez, con el mismo dtype de texto que el camino
+        # fila por fila (y sus kernels .str), y expandir con los códigos conservando ese dtype
+        transformed = op(pd.Series(uniques, dtype=object).astype(self._text_dtype))
+        result = transformed.take(codes)
+        result.index = series.index
+        result.name = series.name
+        return result
+    
     def _remove_accents(self, series: pd.Series) -> pd.Series:
         """Remover acentos de texto"""
-        accent_map = {
-            'á': 'a', 'à': 'a', 'ä': 'a', 'â': 'a', 'ā': 'a', 'ã': 'a',
-            'é': 'e', 'è': 'e', 'ë': 'e', 'ê': 'e', 'ē': 'e',
-            'í': 'i', 'ì': 'i', 'ï': 'i', 'î': 'i', 'ī': 'i',
-            'ó': 'o', 'ò': 'o', 'ö': 'o', 'ô': 'o', 'ō': 'o', 'õ': 'o',
-            'ú': 'u', 'ù': 'u', 'ü': 'u', 'û': 'u', 'ū': 'u',
-            'ñ': 'n', 'ç': 'c',
-            'Á': 'A', 'À': 'A', 'Ä': 'A', 'Â': 'A', 'Ā': 'A', 'Ã': 'A',
-            'É': 'E', 'È': 'E', 'Ë': 'E', 'Ê': 'E', 'Ē': 'E',
-            'Í': 'I', 'Ì': 'I', 'Ï': 'I', 'Î': 'I', 'Ī': 'I',
-            'Ó': 'O', 'Ò': 'O', 'Ö': 'O', 'Ô': 'O', 'Ō': 'O', 'Õ': 'O',
-            'Ú': 'U', 'Ù': 'U', 'Ü': 'U', 'Û': 'U', 'Ū': 'U',
-            'Ñ': 'N', 'Ç': 'C'
-        }
-        
-        result = series.copy()
-        for accented, unaccented in accent_map.items():
-            result = result.str.replace(accented, unaccented)
-        
-        return result
+        # Una sola pasada por cadena en lugar de un str.replace por cada carácter acentuado
+        return series.str.translate(_ACCENT_TABLE)
     
     def _evaluate_condition(self, series: pd.Series, condition_expr: str) -> pd.Series:
         """Evaluar condición de forma segura"""
-        # Reemplazar 'value' con la serie actual en la expresión
-        safe_condition = condition_expr.replace('value', 'series')
+        # Condiciones aritméticas sobre columnas numéricas: numexpr evalúa la expresión
+        # en un solo bucle en C sin arrays booleanos intermedios
+        if (NUMEXPR_AVAILABLE and is_numeric_dtype(series) and isinstance(series.dtype, np.dtype)
+                and '__' not in condition_expr and _NUMEXPR_SAFE_RE.match(condition_expr)):
+            try:
+                mask = numexpr.evaluate(condition_expr, local_dict={'value': series.to_numpy()}, global_dict={})
+                return pd.Series(mask, index=series.index)
+            except Exception:
+                # Expresiones que numexpr no soporta se evalúan con eval
+                pass
         
         # Entorno seguro para evaluación
         safe_locals = {
@@ -384,7 +707,7 @@ class DataTransformer:
         }
         
         try:
-            return eval(safe_condition, {"__builtins__": {}}, safe_locals)
+            return eval(_compile_condition(condition_expr), {"__builtins__": {}}, safe_locals)
         except Exception as e:
             self.logger.error(f"Error evaluando condición '{condition_expr}': {e}")
             return pd.Series([False] * len(series), index=series.index)
@@ -417,22 +740,11 @@ class DataTransformer:
     
     def _validate_custom_code(self, code: str) -> bool:
         """Validar código personalizado por seguridad"""
-        # Lista de palabras/módulos prohibidos por seguridad
-        forbidden_keywords = [
-            'import os', 'import sys', 'import subprocess', 'import socket',
-            'import urllib', 'import requests', 'import http', 'import ftplib',
-            'import smtplib', 'import telnetlib', 'import pickle', 'import marshal',
-            'import ctypes', 'import threading', 'import multiprocessing',
-            'exec(', 'eval(', '__import__', 'open(', 'file(', 'input(',
-            'raw_input(', 'compile(', 'globals(', 'locals(', 'vars(',
-            'dir(', 'hasattr(', 'getattr(', 'setattr(', 'delattr('
-        ]
-        
-        code_lower = code.lower()
-        for keyword in forbidden_keywords:
-            if keyword in code_lower:
-                self.logger.error(f"Código contiene palabra prohibida: {keyword}")
-                return False
+        # Una sola búsqueda con la alternancia precompilada en lugar de una por palabra
+        match = _FORBIDDEN_RE.search(code.lower())
+        if match:
+            self.logger.error(f"Código contiene palabra prohibida: {match.group(0)}")
+            return False
         
         # Intentar compilar el código para verificar sintaxis
         try:
@@ -444,7 +756,18 @@ class DataTransformer:
     
     def get_transformation_history(self) -> List[Dict]:
         """Obtener historial de transformaciones aplicadas"""
-        return self.transformation_history
+        history = []
+        for column, transform_config, timestamp, status, error in self.transformation_history:
+            entry = {
+                "column": column,
+                "transformation": transform_config,
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "status": status
+            }
+            if error is not None:
+                entry["error"] = error
+            history.append(entry)
+        return history
     
     def get_available_transformations(self) -> Dict:
         """Obtener lista de transformaciones disponibles"""
@@ -7,22 +7,168 @@ import numpy as np
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import re
+from collections import Counter
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_datetime64_any_dtype
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from models.base import BaseModel
+from models.validation import ETLDataValidation
+
+# Importación opcional de PyArrow para búsquedas regex con re2
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Importación opcional de Numba para las estadísticas de columnas numéricas grandes
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Importación opcional de Polars para los conteos en DataFrames grandes
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+
+# Patrones de validación compilados una sola vez
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Patrones para inferir tipos (sin distinguir mayúsculas), en orden de prioridad
+_TYPE_PATTERNS = {
+    "email": re.compile(_EMAIL_RE.pattern, re.IGNORECASE),
+    "date": re.compile(r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$|^\d{4}[/-]\d{1,2}[/-]\d{1,2}$', re.IGNORECASE),
+    "numeric": re.compile(r'^-?\d+\.?\d*$', re.IGNORECASE),
+    "phone": re.compile(r'^[\+]?[1-9][\d]{0,15}$', re.IGNORECASE),
+    "url": re.compile(r'^https?://', re.IGNORECASE),
+    "boolean": re.compile(r'^(true|false|yes|no|si|no|1|0)$', re.IGNORECASE)
+}
+
+# Filas a partir de las cuales los conteos por columna se calculan con Polars
+_POLARS_MIN_ROWS = 50000
+
+# Fechas anteriores a esta se consideran sospechosamente antiguas
+_OLDEST_REASONABLE_DATE = datetime(1900, 1, 1)
+
+# Palabras clave de columnas de fecha posiblemente relacionadas
+_DATE_KEYWORDS_RE = re.compile(r'fecha|date|inicio|fin|start|end', re.IGNORECASE)
+
+# Proporción máxima de valores distintos para evaluar los patrones de texto solo sobre ellos
+_DISTINCT_SCAN_MAX_RATIO = 0.5
+
+# Valores a partir de los cuales las estadísticas numéricas usan el kernel Numba
+_NUMBA_MIN_VALUES = 100000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _numeric_summary(values, low, high):
+        """Mínimo, máximo, media, desviación estándar y valores fuera de [low, high] con reducciones paralelas"""
+        n = values.shape[0]
+        minimum = np.inf
+        maximum = -np.inf
+        total = 0.0
+        for i in prange(n):
+            x = values[i]
+            minimum = min(minimum, x)
+            maximum = max(maximum, x)
+            total += x
+        mean = total / n
+        
+        squares = 0.0
+        outliers = 0
+        for i in prange(n):
+            x = values[i]
+            squares += (x - mean) * (x - mean)
+            if x < low or x > high:
+                outliers += 1
+        std = np.sqrt(squares / (n - 1)) if n > 1 else np.nan
+        return minimum, maximum, mean, std, outliers
+
+# Valores no nulos que se examinan para inferir el tipo de una columna
+_INFERENCE_SAMPLE_SIZE = 1000
+
+# Patrones comunes en columnas de texto
+_TEXT_PATTERNS = {
+    "only_numbers": re.compile(r'^\d+$'),
+    "contains_special_chars": re.compile(r'[!@#$%^&*(),.?":{}|<>]'),
+    "all_uppercase": re.compile(r'^[A-Z\s]+$'),
+    "all_lowercase": re.compile(r'^[a-z\s]+$')
+}
+
+
+def _percentage_factor(total: int) -> float:
+    """Factor para convertir un conteo en porcentaje del total (0 si no hay filas)"""
+    return 100.0 / total if total else 0.0
+
+
+def _validation_columns(validations: List[Dict]) -> Dict[str, np.ndarray]:
+    """Convertir la lista de validaciones en arrays por campo para recuentos vectorizados"""
+    return {
+        "column_name": np.array([v["column_name"] for v in validations], dtype=object),
+        "validation_type": np.array([v["validation_type"] for v in validations], dtype=str),
+        "severity": np.array([v.get("severity", "info") for v in validations], dtype=str)
+    }
+
+
+def _validate_column_in_process(session_id: str, use_arrow_strings: bool, series: pd.Series,
+                                null_count: int, unique_count: int,
+                                sample: Optional[pd.Series] = None) -> List[Dict]:
+    """Validar una columna en un proceso del pool (debe ser una función de módulo para serializarse)"""
+    validator = DataValidator(session_id, use_arrow_strings=use_arrow_strings)
+    return validator._validate_column(series.to_frame(), series.name, null_count, unique_count, sample=sample)
+
+
+def _extrapolate(count, scale: float) -> int:
+    """Escalar un conteo obtenido sobre una muestra al total de filas"""
+    return int(round(count * scale))
 
 
 class DataValidator:
     """Validador de calidad de datos"""
     
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, max_workers: int = 1, use_processes: bool = False,
+                 use_arrow_strings: bool = False):
         self.session_id = session_id
+        # Con cadenas Arrow las regex se evalúan con re2 en C++ y los nulos no se cuentan como 'nan'
+        self.use_arrow_strings = use_arrow_strings and PYARROW_AVAILABLE
+        self._text_dtype = 'string[pyarrow]' if self.use_arrow_strings else str
         self.validations = []
+        # Las columnas se validan de forma independiente; con max_workers > 1 en paralelo
+        self.max_workers = max(1, max_workers)
+        # Las regex y conversiones de pandas retienen el GIL: con use_processes=True cada columna
+        # se valida en otro proceso, a cambio de serializar la serie
+        self.use_processes = use_processes
+        self._validation_now = None
     
-    def validate_dataframe(self, df: pd.DataFrame, column_mapping: Dict = None) -> Dict:
-        """Validar un DataFrame completo"""
+    def validate_dataframe(self, df: pd.DataFrame, column_mapping: Dict = None,
+                           sample_size: Optional[int] = None) -> Dict:
+        """Validar un DataFrame completo
+        
+        Con sample_size, si el DataFrame tiene más filas, la inferencia de tipos y las validaciones
+        por tipo (regex, outliers, conversiones) se calculan sobre una muestra y sus conteos se
+        extrapolan; nulos, únicos y validaciones generales siguen siendo exactos.
+        """
+        # Instante de referencia para fechas futuras, común a todas las columnas
+        self._validation_now = datetime.now()
+        
+        # Filas totales y factor de porcentaje calculados una sola vez
+        total_rows = len(df)
+        inv_pct = _percentage_factor(total_rows)
+        
+        # Muestra reproducible para las validaciones costosas en DataFrames muy grandes
+        sample_df = None
+        if sample_size and total_rows > sample_size:
+            sample_df = df.sample(n=sample_size, random_state=0)
+        
         validation_results = {
             "session_id": self.session_id,
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "total_columns": len(df.columns),
+            "sampled_rows": len(sample_df) if sample_df is not None else None,
             "validations": [],
             "summary": {
                 "errors": 0,
@@ -32,37 +178,105 @@ class DataValidator:
             "recommendations": []
         }
         
+        # Nulos y únicos de todas las columnas con una operación sobre el DataFrame completo
+        null_counts, unique_counts = self._column_counts(df)
+        
+        def sample_of(column):
+            return sample_df[column] if sample_df is not None else None
+        
+        def validate(column):
+            return self._validate_column(df, column, int(null_counts[column]), int(unique_counts[column]), inv_pct,
+                                         sample=sample_of(column))
+        
         # Validaciones por columna
-        for column in df.columns:
-            column_validations = self._validate_column(df, column)
+        if self.max_workers > 1 and len(df.columns) > 1 and self.use_processes:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                columns_validations = list(executor.map(
+                    _validate_column_in_process,
+                    [self.session_id] * len(df.columns),
+                    [self.use_arrow_strings] * len(df.columns),
+                    [df[column] for column in df.columns],
+                    [int(null_counts[column]) for column in df.columns],
+                    [int(unique_counts[column]) for column in df.columns],
+                    [sample_of(column) for column in df.columns]
+                ))
+        elif self.max_workers > 1 and len(df.columns) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                columns_validations = list(executor.map(validate, df.columns))
+        else:
+            columns_validations = [validate(column) for column in df.columns]
+        
+        for column_validations in columns_validations:
             validation_results["validations"].extend(column_validations)
         
         # Validaciones generales del DataFrame
-        general_validations = self._validate_general(df)
+        general_validations = self._validate_general(df, null_counts, unique_counts, inv_pct)
         validation_results["validations"].extend(general_validations)
         
+        # Vista columnar de las validaciones, construida una sola vez para los recuentos
+        records = _validation_columns(validation_results["validations"])
+        
         # Contar severidades
-        for validation in validation_results["validations"]:
-            severity = validation.get("severity", "info")
-            if severity in validation_results["summary"]:
-                validation_results["summary"][severity] += 1
+        severity_counts = Counter(records["severity"].tolist())
+        for severity in validation_results["summary"]:
+            validation_results["summary"][severity] = int(severity_counts[severity])
         
         # Generar recomendaciones
-        validation_results["recommendations"] = self._generate_recommendations(validation_results["validations"])
+        validation_results["recommendations"] = self._generate_recommendations(
+            validation_results["validations"], severity_counts, records
+        )
         
         # Guardar validaciones en base de datos
         self._save_validations(validation_results["validations"])
         
         return validation_results
     
-    def _validate_column(self, df: pd.DataFrame, column: str) -> List[Dict]:
+    def _column_counts(self, df: pd.DataFrame):
+        """Contar nulos y valores únicos (sin nulos) de cada columna"""
+        if POLARS_AVAILABLE and len(df) > _POLARS_MIN_ROWS and df.columns.is_unique:
+            try:
+                # Un solo plan lazy calcula todos los conteos en paralelo entre columnas
+                ldf = pl.from_pandas(df.rename(columns=str)).lazy()
+                exprs = []
+                for name in map(str, df.columns):
+                    exprs.append(pl.col(name).null_count().alias(f"{name}__nulls"))
+                    exprs.append(pl.col(name).drop_nulls().n_unique().alias(f"{name}__nunique"))
+                row = ldf.select(exprs).collect().row(0)
+                null_counts = pd.Series(row[0::2], index=df.columns)
+                unique_counts = pd.Series(row[1::2], index=df.columns)
+                return null_counts, unique_counts
+            except Exception:
+                # Columnas que Polars no puede convertir (por ejemplo, objetos mixtos)
+                pass
+        
+        # Un solo recorrido con hash por columna: factorize marca los nulos con -1
+        # y devuelve los valores distintos sin ellos
+        null_counts = []
+        unique_counts = []
+        for position in range(len(df.columns)):
+            codes, uniques = pd.factorize(df.iloc[:, position])
+            null_counts.append(int(np.count_nonzero(codes < 0)))
+            unique_counts.append(len(uniques))
+        return pd.Series(null_counts, index=df.columns), pd.Series(unique_counts, index=df.columns)
+    
+    def _validate_column(self, df: pd.DataFrame, column: str, null_count: Optional[int] = None,
+                         unique_count: Optional[int] = None, inv_pct: Optional[float] = None,
+                         sample: Optional[pd.Series] = None) -> List[Dict]:
         """Validar una columna específica"""
         validations = []
         series = df[column]
+        total_rows = len(series)
+        # Sin muestra las validaciones por tipo recorren la columna completa
+        if sample is None or len(sample) == 0:
+            sample = series
+        scale = total_rows / len(sample) if len(sample) else 1.0
+        if inv_pct is None:
+            inv_pct = _percentage_factor(total_rows)
         
         # Validación de valores nulos
-        null_count = series.isnull().sum()
-        null_percentage = (null_count / len(series)) * 100
+        if null_count is None:
+            null_count = int(series.isnull().sum())
+        null_percentage = null_count * inv_pct
         
         validations.append({
             "column_name": column,
@@ -70,16 +284,17 @@ class DataValidator:
             "validation_result": {
                 "null_count": int(null_count),
                 "null_percentage": round(null_percentage, 2),
-                "total_rows": len(series)
+                "total_rows": total_rows
             },
             "severity": "error" if null_percentage > 50 else "warning" if null_percentage > 10 else "info",
             "message": f"Columna '{column}' tiene {null_count} valores nulos ({null_percentage:.1f}%)"
         })
         
         # Validación de valores únicos/duplicados
-        unique_count = series.nunique()
-        duplicate_count = len(series) - unique_count
-        duplicate_percentage = (duplicate_count / len(series)) * 100
+        if unique_count is None:
+            unique_count = int(series.nunique())
+        duplicate_count = total_rows - unique_count
+        duplicate_percentage = duplicate_count * inv_pct
         
         validations.append({
             "column_name": column,
@@ -88,14 +303,14 @@ class DataValidator:
                 "unique_count": int(unique_count),
                 "duplicate_count": int(duplicate_count),
                 "duplicate_percentage": round(duplicate_percentage, 2),
-                "total_rows": len(series)
+                "total_rows": total_rows
             },
             "severity": "warning" if duplicate_percentage > 80 else "info",
             "message": f"Columna '{column}' tiene {unique_count} valores únicos, {duplicate_count} duplicados"
         })
         
         # Validación de tipo de datos
-        inferred_type = self._infer_data_type(series)
+        inferred_type = self._infer_data_type(sample)
         validations.append({
             "column_name": column,
             "validation_type": "data_type",
@@ -108,45 +323,58 @@ class DataValidator:
             "message": f"Columna '{column}' parece ser de tipo '{inferred_type}'"
         })
         
-        # Validaciones específicas por tipo
+        # Validaciones específicas por tipo; sobre una muestra los nulos y porcentajes son los de la muestra
+        if sample is not series:
+            null_count, inv_pct = None, None
         if inferred_type == "numeric":
-            validations.extend(self._validate_numeric_column(series, column))
+            validations.extend(self._validate_numeric_column(sample, column, null_count, inv_pct, scale))
         elif inferred_type == "date":
-            validations.extend(self._validate_date_column(series, column))
+            validations.extend(self._validate_date_column(sample, column, null_count, inv_pct, scale))
         elif inferred_type == "text":
-            validations.extend(self._validate_text_column(series, column))
+            validations.extend(self._validate_text_column(sample, column, scale))
         elif inferred_type == "email":
-            validations.extend(self._validate_email_column(series, column))
+            validations.extend(self._validate_email_column(sample, column, scale))
         
         return validations
     
-    def _validate_general(self, df: pd.DataFrame) -> List[Dict]:
+    def _validate_general(self, df: pd.DataFrame, null_counts: Optional[pd.Series] = None,
+                          unique_counts: Optional[pd.Series] = None, inv_pct: Optional[float] = None) -> List[Dict]:
         """Validaciones generales del DataFrame"""
         validations = []
-        
-        # Validación de filas completamente vacías
-        empty_rows = df.isnull().all(axis=1).sum()
+        if inv_pct is None:
+            inv_pct = _percentage_factor(len(df))
+        
+        # Validación de filas completamente vacías; si alguna columna no tiene nulos
+        # ninguna fila puede estar vacía y se evita recorrer el DataFrame
+        if null_counts is not None and (null_counts == 0).any():
+            empty_rows = 0
+        else:
+            empty_rows = df.isnull().all(axis=1).sum()
         if empty_rows > 0:
             validations.append({
                 "column_name": "ALL",
                 "validation_type": "empty_rows",
                 "validation_result": {
                     "empty_rows": int(empty_rows),
-                    "percentage": round((empty_rows / len(df)) * 100, 2)
+                    "percentage": round(empty_rows * inv_pct, 2)
                 },
                 "severity": "warning",
                 "message": f"Se encontraron {empty_rows} filas completamente vacías"
             })
         
-        # Validación de filas duplicadas
-        duplicate_rows = df.duplicated().sum()
+        # Validación de filas duplicadas; si alguna columna tiene todos sus valores distintos
+        # no puede haber filas repetidas y se evita el hash de cada fila
+        if unique_counts is not None and (unique_counts == len(df)).any():
+            duplicate_rows = 0
+        else:
+            duplicate_rows = df.duplicated().sum()
         if duplicate_rows > 0:
             validations.append({
                 "column_name": "ALL",
                 "validation_type": "duplicate_rows",
                 "validation_result": {
                     "duplicate_rows": int(duplicate_rows),
-                    "percentage": round((duplicate_rows / len(df)) * 100, 2)
+                    "percentage": round(duplicate_rows * inv_pct, 2)
                 },
                 "severity": "warning",
                 "message": f"Se encontraron {duplicate_rows} filas completamente duplicadas"
@@ -159,71 +387,98 @@ class DataValidator:
         
         return validations
     
-    def _validate_numeric_column(self, series: pd.Series, column: str) -> List[Dict]:
+    def _validate_numeric_column(self, series: pd.Series, column: str, null_count: Optional[int] = None,
+                                 inv_pct: Optional[float] = None, scale: float = 1.0) -> List[Dict]:
         """Validaciones específicas para columnas numéricas"""
         validations = []
+        if inv_pct is None:
+            inv_pct = _percentage_factor(len(series))
+        if null_count is None:
+            null_count = int(series.isnull().sum())
         
-        # Convertir a numérico para análisis
-        numeric_series = pd.to_numeric(series, errors='coerce')
-        conversion_errors = numeric_series.isnull().sum() - series.isnull().sum()
+        # Convertir a numérico para análisis; una columna ya numérica se reutiliza tal cual
+        numeric_series = series if is_numeric_dtype(series) else pd.to_numeric(series, errors='coerce')
+        sample_errors = numeric_series.isnull().sum() - null_count
+        conversion_errors = _extrapolate(sample_errors, scale)
         
         if conversion_errors > 0:
             validations.append({
                 "column_name": column,
                 "validation_type": "numeric_conversion_errors",
                 "validation_result": {
-                    "conversion_errors": int(conversion_errors),
-                    "percentage": round((conversion_errors / len(series)) * 100, 2)
+                    "conversion_errors": conversion_errors,
+                    "percentage": round(sample_errors * inv_pct, 2)
                 },
                 "severity": "error",
                 "message": f"Columna '{column}' tiene {conversion_errors} valores que no se pueden convertir a número"
             })
         
-        # Estadísticas numéricas
-        if not numeric_series.dropna().empty:
+        # Estadísticas numéricas sobre un solo array float64 sin nulos
+        values = numeric_series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if values.size:
+            # Cuartiles y mediana con una sola llamada a quantile
+            Q1, median, Q3 = np.quantile(values, [0.25, 0.5, 0.75])
+            IQR = Q3 - Q1
+            low, high = Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+            
+            if NUMBA_AVAILABLE and values.size >= _NUMBA_MIN_VALUES:
+                # Resto de estadísticas y outliers en dos pasadas paralelas compiladas
+                minimum, maximum, mean, std, outliers_count = _numeric_summary(values, low, high)
+            else:
+                minimum, maximum, mean = values.min(), values.max(), values.mean()
+                std = values.std(ddof=1) if values.size > 1 else float('nan')
+                # Detectar outliers
+                outliers_count = np.count_nonzero((values < low) | (values > high))
+            
+            sample_outliers = int(outliers_count)
+            outliers_count = _extrapolate(sample_outliers, scale)
             stats = {
-                "min": float(numeric_series.min()),
-                "max": float(numeric_series.max()),
-                "mean": float(numeric_series.mean()),
-                "median": float(numeric_series.median()),
-                "std": float(numeric_series.std())
+                "min": float(minimum),
+                "max": float(maximum),
+                "mean": float(mean),
+                "median": float(median),
+                "std": float(std)
             }
             
-            # Detectar outliers
-            Q1 = numeric_series.quantile(0.25)
-            Q3 = numeric_series.quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = numeric_series[(numeric_series < (Q1 - 1.5 * IQR)) | (numeric_series > (Q3 + 1.5 * IQR))]
-            
             validations.append({
                 "column_name": column,
                 "validation_type": "numeric_statistics",
                 "validation_result": {
                     "statistics": stats,
-                    "outliers_count": len(outliers),
-                    "outliers_percentage": round((len(outliers) / len(numeric_series.dropna())) * 100, 2)
+                    "outliers_count": outliers_count,
+                    "outliers_percentage": round((sample_outliers / values.size) * 100, 2)
                 },
-                "severity": "warning" if len(outliers) > len(numeric_series) * 0.1 else "info",
-                "message": f"Columna '{column}': {len(outliers)} valores atípicos detectados"
+                "severity": "warning" if sample_outliers > len(numeric_series) * 0.1 else "info",
+                "message": f"Columna '{column}': {outliers_count} valores atípicos detectados"
             })
         
         return validations
     
-    def _validate_date_column(self, series: pd.Series, column: str) -> List[Dict]:
+    def _validate_date_column(self, series: pd.Series, column: str, null_count: Optional[int] = None,
+                              inv_pct: Optional[float] = None, scale: float = 1.0) -> List[Dict]:
         """Validaciones específicas para columnas de fecha"""
         validations = []
-        
-        # Intentar convertir a fecha
-        date_series = pd.to_datetime(series, errors='coerce', infer_datetime_format=True)
-        conversion_errors = date_series.isnull().sum() - series.isnull().sum()
+        if inv_pct is None:
+            inv_pct = _percentage_factor(len(series))
+        if null_count is None:
+            null_count = int(series.isnull().sum())
+        
+        # Intentar convertir a fecha; una columna ya de fechas se reutiliza tal cual
+        if is_datetime64_any_dtype(series):
+            date_series = series
+        else:
+            date_series = pd.to_datetime(series, errors='coerce', infer_datetime_format=True)
+        sample_errors = date_series.isnull().sum() - null_count
+        conversion_errors = _extrapolate(sample_errors, scale)
         
         if conversion_errors > 0:
             validations.append({
                 "column_name": column,
                 "validation_type": "date_conversion_errors",
                 "validation_result": {
-                    "conversion_errors": int(conversion_errors),
-                    "percentage": round((conversion_errors / len(series)) * 100, 2)
+                    "conversion_errors": conversion_errors,
+                    "percentage": round(sample_errors * inv_pct, 2)
                 },
                 "severity": "error",
                 "message": f"Columna '{column}' tiene {conversion_errors} valores que no se pueden convertir a fecha"
@@ -235,10 +490,10 @@ class DataValidator:
             max_date = date_series.max()
             
             # Detectar fechas futuras
-            future_dates = date_series[date_series > datetime.now()].count()
+            future_dates = _extrapolate((date_series > (self._validation_now or datetime.now())).sum(), scale)
             
             # Detectar fechas muy antiguas (antes de 1900)
-            old_dates = date_series[date_series < datetime(1900, 1, 1)].count()
+            old_dates = _extrapolate((date_series < _OLDEST_REASONABLE_DATE).sum(), scale)
             
             validations.append({
                 "column_name": column,
@@ -255,12 +510,16 @@ class DataValidator:
         
         return validations
     
-    def _validate_text_column(self, series: pd.Series, column: str) -> List[Dict]:
+    def _validate_text_column(self, series: pd.Series, column: str, scale: float = 1.0) -> List[Dict]:
         """Validaciones específicas para columnas de texto"""
         validations = []
         
+        # Una sola conversión a texto para longitudes y patrones
+        text_series = series.astype(self._text_dtype)
+        
         # Longitud de texto
-        text_lengths = series.astype(str).str.len()
+        text_lengths = text_series.str.len()
+        avg_length = text_lengths.mean()
         
         validations.append({
             "column_name": column,
@@ -268,25 +527,30 @@ class DataValidator:
             "validation_result": {
                 "min_length": int(text_lengths.min()),
                 "max_length": int(text_lengths.max()),
-                "avg_length": round(text_lengths.mean(), 2),
-                "empty_strings": int((series == "").sum())
+                "avg_length": round(avg_length, 2),
+                "empty_strings": _extrapolate((series == "").sum(), scale)
             },
             "severity": "info",
-            "message": f"Columna '{column}': longitud promedio {text_lengths.mean():.1f} caracteres"
+            "message": f"Columna '{column}': longitud promedio {avg_length:.1f} caracteres"
         })
         
-        # Patrones comunes
-        patterns = {
-            "only_numbers": r'^\d+$',
-            "contains_special_chars": r'[!@#$%^&*(),.?":{}|<>]',
-            "all_uppercase": r'^[A-Z\s]+$',
-            "all_lowercase": r'^[a-z\s]+$'
-        }
+        # Patrones comunes; con pocos valores distintos cada uno se evalúa una sola vez
+        # y sus coincidencias se ponderan con su frecuencia
+        codes, uniques = pd.factorize(text_series)
+        if len(uniques) <= len(text_series) * _DISTINCT_SCAN_MAX_RATIO:
+            frequencies = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            scan_series = pd.Series(uniques, dtype=text_series.dtype)
+        else:
+            frequencies = None
+            scan_series = text_series
         
         pattern_results = {}
-        for pattern_name, pattern in patterns.items():
-            matches = series.astype(str).str.contains(pattern, regex=True, na=False).sum()
-            pattern_results[pattern_name] = int(matches)
+        for pattern_name, pattern in _TEXT_PATTERNS.items():
+            if frequencies is None:
+                matches = self._count_matches(text_series, pattern)
+            else:
+                matches = frequencies[self._match_mask(scan_series, pattern)].sum()
+            pattern_results[pattern_name] = _extrapolate(matches, scale)
         
         validations.append({
             "column_name": column,
@@ -298,13 +562,14 @@ class DataValidator:
         
         return validations
     
-    def _validate_email_column(self, series: pd.Series, column: str) -> List[Dict]:
+    def _validate_email_column(self, series: pd.Series, column: str, scale: float = 1.0) -> List[Dict]:
         """Validaciones específicas para columnas de email"""
         validations = []
         
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        valid_emails = series.astype(str).str.contains(email_pattern, regex=True, na=False).sum()
-        invalid_emails = len(series.dropna()) - valid_emails
+        sample_valid = self._count_matches(series.astype(self._text_dtype), _EMAIL_RE)
+        sample_non_null = int(series.notna().sum())
+        valid_emails = _extrapolate(sample_valid, scale)
+        invalid_emails = _extrapolate(sample_non_null - sample_valid, scale)
         
         validations.append({
             "column_name": column,
@@ -312,7 +577,7 @@ class DataValidator:
             "validation_result": {
                 "valid_emails": int(valid_emails),
                 "invalid_emails": int(invalid_emails),
-                "validity_percentage": round((valid_emails / len(series.dropna())) * 100, 2) if len(series.dropna()) > 0 else 0
+                "validity_percentage": round((sample_valid / sample_non_null) * 100, 2) if sample_non_null > 0 else 0
             },
             "severity": "error" if invalid_emails > valid_emails else "warning" if invalid_emails > 0 else "info",
             "message": f"Columna '{column}': {valid_emails} emails válidos, {invalid_emails} inválidos"
@@ -320,6 +585,20 @@ class DataValidator:
         
         return validations
     
+    def _count_matches(self, text_series: pd.Series, pattern) -> int:
+        """Contar los valores que contienen el patrón compilado"""
+        return int(self._match_mask(text_series, pattern).sum())
+    
+    def _match_mask(self, text_series: pd.Series, pattern) -> np.ndarray:
+        """Máscara booleana de los valores que contienen el patrón compilado"""
+        if self.use_arrow_strings:
+            # pandas delega en pyarrow.compute (re2) solo con el patrón como texto
+            case = not (pattern.flags & re.IGNORECASE)
+            matches = text_series.str.contains(pattern.pattern, case=case, regex=True, na=False)
+        else:
+            matches = text_series.str.contains(pattern, regex=True, na=False)
+        return matches.to_numpy(dtype=bool)
+    
     def _infer_data_type(self, series: pd.Series) -> str:
         """Inferir el tipo de datos de una serie"""
         # Eliminar valores nulos para análisis
@@ -328,35 +607,34 @@ class DataValidator:
         if clean_series.empty:
             return "empty"
         
+        # Columnas ya tipadas al cargarlas: el dtype decide sin analizar patrones
+        if is_bool_dtype(series):
+            return "boolean"
+        if is_numeric_dtype(series):
+            return "numeric"
+        if is_datetime64_any_dtype(series):
+            return "date"
+        
+        # La inferencia se hace sobre una muestra acotada de valores no nulos,
+        # así el coste no crece con el tamaño de la columna
+        sample = clean_series.head(_INFERENCE_SAMPLE_SIZE)
+        
         # Convertir a string para análisis de patrones
-        str_series = clean_series.astype(str)
-        
-        # Patrones para diferentes tipos
-        patterns = {
-            "email": r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
-            "date": r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$|^\d{4}[/-]\d{1,2}[/-]\d{1,2}$',
-            "numeric": r'^-?\d+\.?\d*$',
-            "phone": r'^[\+]?[1-9][\d]{0,15}$',
-            "url": r'^https?://',
-            "boolean": r'^(true|false|yes|no|si|no|1|0)$'
-        }
+        str_series = sample.astype(self._text_dtype)
         
         # Verificar patrones
-        for data_type, pattern in patterns.items():
-            matches = str_series.str.contains(pattern, regex=True, case=False).sum()
+        for data_type, pattern in _TYPE_PATTERNS.items():
+            matches = self._count_matches(str_series, pattern)
             if matches / len(str_series) > 0.8:  # 80% de coincidencia
                 return data_type
         
         # Intentar conversión numérica
-        try:
-            pd.to_numeric(clean_series)
+        if pd.to_numeric(sample, errors='coerce').notna().all():
             return "numeric"
-        except:
-            pass
         
         # Intentar conversión de fecha
         try:
-            pd.to_datetime(clean_series, infer_datetime_format=True)
+            pd.to_datetime(sample, infer_datetime_format=True)
             return "date"
         except:
             pass
@@ -369,10 +647,7 @@ class DataValidator:
         # Por ejemplo, verificar que fecha_inicio < fecha_fin
         
         # Buscar columnas que podrían estar relacionadas
-        date_columns = []
-        for col in df.columns:
-            if any(keyword in col.lower() for keyword in ['fecha', 'date', 'inicio', 'fin', 'start', 'end']):
-                date_columns.append(col)
+        date_columns = [col for col in df.columns if _DATE_KEYWORDS_RE.search(str(col))]
         
         if len(date_columns) >= 2:
             return {
@@ -388,22 +663,27 @@ class DataValidator:
         
         return None
     
-    def _generate_recommendations(self, validations: List[Dict]) -> List[str]:
+    def _generate_recommendations(self, validations: List[Dict], severity_counts: Optional[Counter] = None,
+                                  records: Optional[Dict[str, np.ndarray]] = None) -> List[str]:
         """Generar recomendaciones basadas en las validaciones"""
         recommendations = []
-        
-        # Contar tipos de problemas
-        high_null_columns = []
-        conversion_error_columns = []
-        outlier_columns = []
-        
-        for validation in validations:
-            if validation["validation_type"] == "null_count" and validation["severity"] in ["error", "warning"]:
-                high_null_columns.append(validation["column_name"])
-            elif "conversion_errors" in validation["validation_type"] and validation["severity"] == "error":
-                conversion_error_columns.append(validation["column_name"])
-            elif validation["validation_type"] == "numeric_statistics" and validation["validation_result"].get("outliers_count", 0) > 0:
-                outlier_columns.append(validation["column_name"])
+        if records is None:
+            records = _validation_columns(validations)
+        
+        # Contar tipos de problemas con máscaras sobre la vista columnar
+        types = records["validation_type"]
+        severities = records["severity"]
+        names = records["column_name"]
+        
+        high_null_mask = (types == "null_count") & np.isin(severities, ["error", "warning"])
+        conversion_error_mask = (np.char.find(types, "conversion_errors") >= 0) & (severities == "error")
+        high_null_columns = names[high_null_mask].tolist()
+        conversion_error_columns = names[conversion_error_mask].tolist()
+        # Solo las estadísticas numéricas necesitan mirar el resultado de la validación
+        outlier_columns = [
+            names[index] for index in np.flatnonzero(types == "numeric_statistics")
+            if validations[index]["validation_result"].get("outliers_count", 0) > 0
+        ]
         
         # Generar recomendaciones específicas
         if high_null_columns:
@@ -415,9 +695,11 @@ class DataValidator:
         if outlier_columns:
             recommendations.append(f"Analice valores atípicos en: {', '.join(outlier_columns)}")
         
-        # Recomendaciones generales
-        total_errors = sum(1 for v in validations if v["severity"] == "error")
-        total_warnings = sum(1 for v in validations if v["severity"] == "warning")
+        # Recomendaciones generales; las severidades ya contadas se reutilizan
+        if severity_counts is None:
+            severity_counts = Counter(v["severity"] for v in validations)
+        total_errors = severity_counts["error"]
+        total_warnings = severity_counts["warning"]
         
         if total_errors > 0:
             recommendations.append(f"Se encontraron {total_errors} errores críticos que deben corregirse antes de procesar")
@@ -432,22 +714,11 @@ class DataValidator:
     
     def _save_validations(self, validations: List[Dict]):
         """Guardar validaciones en la base de datos"""
-        from models.validation import ETLDataValidation
-        
-        for validation in validations:
-            validation_record = ETLDataValidation(
-                session_id=self.session_id,
-                column_name=validation["column_name"],
-                validation_type=validation["validation_type"],
-                validation_result=validation["validation_result"],
-                severity=validation["severity"]
-            )
-            validation_record.save()
+        # Un solo COPY en lugar de una conexión y un INSERT por validación
+        ETLDataValidation.bulk_save(self.session_id, validations)
     
     @classmethod
     def get_validation_history(cls, session_id: str) -> List[Dict]:
         """Obtener historial de validaciones para una sesión"""
-        from models.validation import ETLDataValidation
-        
         validations = ETLDataValidation.find_all("session_id = %s", (session_id,))
         return [v.to_dict() for v in validations]
@@ -0,0 +1,67 @@
+"""
+Fixtures compartidas para las pruebas del sistema ETL
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# Raíz del proyecto en el path para importar los módulos ETL (modules, models, config)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# URL base para pruebas
+BASE_URL = "http://localhost:8000/api/etl"
+
+# Espera a que el servidor esté disponible: intentos, timeout por intento y pausa entre ellos (segundos)
+SERVER_READY_ATTEMPTS = 20
+SERVER_READY_TIMEOUT = 0.5
+SERVER_READY_DELAY = 0.25
+
+# Timeout de conexión a PostgreSQL para las pruebas que lo necesitan (segundos)
+DB_CONNECT_TIMEOUT = 2
+
+@pytest.fixture(scope="session")
+def base_url():
+    """URL base de la API ETL bajo prueba"""
+    return BASE_URL
+
+@pytest.fixture(scope="session")
+def session():
+    """Sesión HTTP compartida: todas las pruebas reutilizan la misma conexión keep-alive"""
+    http = requests.Session()
+    http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    http.headers["Connection"] = "keep-alive"
+    yield http
+    http.close()
+
+@pytest.fixture(scope="session")
+def server_ready(session, base_url):
+    """Esperar a que el servidor responda en /health, dejando abierta la conexión del pool"""
+    for _ in range(SERVER_READY_ATTEMPTS):
+        try:
+            response = session.get(f"{base_url}/health", timeout=SERVER_READY_TIMEOUT)
+            if response.status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(SERVER_READY_DELAY)
+    pytest.skip(f"Servidor ETL no disponible en {base_url}")
+
+@pytest.fixture
+def db_conn():
+    """Conexión a la base de datos de DATABASE_CONFIG; omite la prueba si PostgreSQL no está disponible"""
+    psycopg2 = pytest.importorskip("psycopg2")
+    from config import DATABASE_CONFIG
+
+    try:
+        conn = psycopg2.connect(connect_timeout=DB_CONNECT_TIMEOUT, **DATABASE_CONFIG)
+    except psycopg2.OperationalError:
+        pytest.skip(f"PostgreSQL no disponible en {DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}")
+    yield conn
+    conn.close()
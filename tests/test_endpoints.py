@@ -1,232 +1,427 @@
 """
 Tests para endpoints del sistema ETL avanzado
+
+Las pruebas independientes pueden ejecutarse en paralelo con pytest-xdist:
+    pytest -n auto --dist loadgroup tests/
+
+Las pruebas marcadas como slow se excluyen por defecto; para ejecutarlas todas:
+    pytest -m "" tests/
 """
 
 import pytest
-import requests
+from requests.adapters import HTTPAdapter
 import json
 from pathlib import Path
 import os
+import time
+import itertools
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# La URL base (base_url), la sesión HTTP compartida y la espera al servidor son fixtures de conftest.py
+
+# Importación opcional de requests-cache para reutilizar entre ejecuciones las respuestas deterministas
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Importación opcional de orjson para serializar las cargas JSON de las pruebas
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-# URL base para pruebas
-BASE_URL = "http://localhost:8000/api/etl"
+# Importación opcional de requests-toolbelt para enviar los archivos como cuerpo multipart en streaming
+try:
+    from requests_toolbelt import MultipartEncoder
+    REQUESTS_TOOLBELT_AVAILABLE = True
+except ImportError:
+    REQUESTS_TOOLBELT_AVAILABLE = False
 
-# Datos de prueba
+# Todas las pruebas de este módulo necesitan el servidor en marcha
+pytestmark = pytest.mark.usefixtures("server_ready")
+
+# Datos de prueba (versionados en el repositorio)
 TEST_DATA_DIR = Path(__file__).parent / "test_data"
 TEST_FILE = TEST_DATA_DIR / "test_data.csv"
 
-def setup_module():
-    """Configuración inicial para las pruebas"""
-    # Crear directorio de datos de prueba si no existe
-    TEST_DATA_DIR.mkdir(exist_ok=True)
-    
-    # Crear archivo CSV de prueba
-    if not TEST_FILE.exists():
-        with open(TEST_FILE, 'w') as f:
-            f.write("nombre,edad,email\n")
-            f.write("Juan Pérez,30,juan@test.com\n")
-            f.write("María García,25,maria@test.com\n")
-
-class TestETLEndpoints:
-    """Suite de pruebas para endpoints ETL"""
-    
-    def test_health_check(self):
-        """Probar endpoint de salud"""
-        response = requests.get(f"{BASE_URL}/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "healthy"
-        assert "queue_status" in data
-    
-    def test_upload_file(self):
-        """Probar carga de archivo"""
-        with open(TEST_FILE, 'rb') as f:
-            files = {'file': f}
-            response = requests.post(f"{BASE_URL}/upload", files=files)
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "session_id" in data
-        assert "file_type" in data
-        return data["session_id"]
-    
-    def test_preview_data(self):
-        """Probar vista previa de datos"""
-        session_id = self.test_upload_file()
-        
-        response = requests.post(
-            f"{BASE_URL}/preview",
-            data={
-                "session_id": session_id,
-                "sheet": "default"
-            }
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "columns" in data
-        assert "preview_data" in data
-        assert len(data["preview_data"]) > 0
-        return session_id
-    
-    def test_validate_data(self):
-        """Probar validación de datos"""
-        session_id = self.test_preview_data()
-        
-        response = requests.post(
-            f"{BASE_URL}/validate",
-            json={
-                "session_id": session_id,
-                "sheet": "default"
-            }
-        )
-        
+# Trabajador de pytest-xdist, para que los recursos guardados en el servidor no colisionen
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+# Endpoints de solo lectura sin dependencias entre sí
+READONLY_ENDPOINTS = ["/health", "/history", "/history/statistics", "/notifications/templates"]
+
+# GETs estáticos que se guardan en la caché HTTP en disco; /history/statistics no, porque
+# cambia con cada proceso registrado y una respuesta cacheada ocultaría regresiones
+CACHED_GET_ENDPOINTS = ["/notifications/templates"]
+HTTP_CACHE_NAME = ".pytest_http_cache"
+HTTP_CACHE_EXPIRE = 3600  # segundos
+
+def _dumps(obj) -> bytes:
+    """Serializar un objeto a JSON en bytes (con orjson si está disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def _json(response) -> dict:
+    """Decodificar el cuerpo JSON de una respuesta (con orjson si está disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Cargas de las pruebas, serializadas una sola vez al importar el módulo
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+PROCESS_FORM = {
+    "sheet": "default",
+    "column_mapping": _dumps({"nombre": "name", "edad": "age", "email": "email"}).decode('utf-8'),
+    "transformations": _dumps({
+        "name": {"type": "text", "options": {"text_transform": "upper"}}
+    }).decode('utf-8'),
+    "target_table": "personas",
+    "mode": "insert"
+}
+
+CONFIG_NAME = f"test_config_{WORKER_ID}"
+CONFIG_JSON = _dumps({
+    "name": CONFIG_NAME,
+    "description": "Configuración de prueba",
+    "column_mapping": {"nombre": "name", "edad": "age"},
+    "transformations": {
+        "name": {"type": "text", "options": {"text_transform": "upper"}}
+    },
+    "target_table": "personas",
+    "mode": "insert"
+})
+
+NOTIFICATION_CONFIG_JSON = _dumps({
+    "name": f"test_notification_{WORKER_ID}",
+    "type": "email",
+    "config": {
+        "smtp_server": "smtp.test.com",
+        "smtp_port": 587,
+        "username": "test@test.com",
+        "password": "test123",
+        "from_email": "etl@test.com",
+        "to_emails": ["admin@test.com"]
+    },
+    "events": {
+        "types": ["load_completed", "load_failed"],
+        "conditions": {
+            "only_on_errors": False,
+            "min_success_rate": 95
+        }
+    }
+})
+
+# Carga por bloques de archivos grandes: tamaño de bloque por defecto y tamaño del CSV generado
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+LARGE_FILE_SIZE = 64 << 20  # 64 MiB
+
+def _chunk_iter(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE, boundary: str = None):
+    """Generar el cuerpo multipart de un archivo leyéndolo en bloques de chunk_size bytes"""
+    yield (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{path.name}"\r\n'
+        'Content-Type: text/csv\r\n\r\n'
+    ).encode()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+# Estados finales de un trabajo asíncrono y espera máxima hasta alcanzarlos
+JOB_FINAL_STATES = ("completed", "failed", "cancelled")
+JOB_WAIT_TIMEOUT = 30  # segundos
+
+def _wait_for_job(session, base_url: str, job_id: str, timeout: float = JOB_WAIT_TIMEOUT) -> dict:
+    """Consultar el estado de un trabajo con espera exponencial (0.1 s, 0.2 s, ... hasta 2 s) hasta que termine"""
+    deadline = time.monotonic() + timeout
+    delays = itertools.chain([0.1, 0.2, 0.4, 0.8, 1.6], itertools.repeat(2.0))
+    while True:
+        response = session.get(f"{base_url}/job-status/{job_id}")
         assert response.status_code == 200
-        data = response.json()
-        assert "validations" in data
-        assert "summary" in data
-        return session_id
-    
-    def test_custom_transformation(self):
-        """Probar creación de transformación personalizada"""
-        code = """
+        data = _json(response)
+        remaining = deadline - time.monotonic()
+        if data.get("status") in JOB_FINAL_STATES or remaining <= 0:
+            return data
+        time.sleep(min(next(delays), remaining))
+
+@pytest.fixture(scope="session", autouse=True)
+def test_data_file():
+    """Comprobar que el CSV de prueba está disponible"""
+    assert TEST_FILE.is_file(), f"No se encontró el archivo de prueba {TEST_FILE}"
+    return TEST_FILE
+
+@pytest.fixture(scope="module")
+def test_data_bytes(test_data_file):
+    """Contenido del CSV de prueba, leído una sola vez"""
+    return test_data_file.read_bytes()
+
+@pytest.fixture(scope="module")
+def large_test_file(tmp_path_factory, test_data_bytes):
+    """CSV de unos LARGE_FILE_SIZE bytes generado repitiendo las filas del archivo de prueba"""
+    header, rows = test_data_bytes.split(b"\n", 1)
+    path = tmp_path_factory.mktemp("large") / "large_test_data.csv"
+    path.write_bytes(header + b"\n" + rows * (LARGE_FILE_SIZE // len(rows) + 1))
+    return path
+
+@pytest.fixture(scope="module")
+def cached_session(session):
+    """Sesión con caché HTTP en disco para CACHED_GET_ENDPOINTS; sin requests-cache es la sesión compartida"""
+    if not REQUESTS_CACHE_AVAILABLE:
+        yield session
+        return
+    # Sesión aparte: requests-cache lee el cuerpo de cada petición para calcular su clave,
+    # lo que consumiría las cargas en streaming
+    http = requests_cache.CachedSession(
+        cache_name=HTTP_CACHE_NAME,
+        backend="sqlite",
+        expire_after=HTTP_CACHE_EXPIRE,
+        allowable_methods=("GET",)
+    )
+    http.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    http.headers["Connection"] = "keep-alive"
+    yield http
+    http.close()
+
+@pytest.fixture(scope="module")
+def readonly_responses(session, base_url, cached_session):
+    """Respuestas de READONLY_ENDPOINTS, pedidas todas a la vez en paralelo al iniciar el módulo"""
+    with ThreadPoolExecutor(max_workers=len(READONLY_ENDPOINTS)) as executor:
+        futures = {
+            executor.submit((cached_session if path in CACHED_GET_ENDPOINTS else session).get, f"{base_url}{path}"): path
+            for path in READONLY_ENDPOINTS
+        }
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+# Cada paso del pipeline se ejecuta una sola vez por módulo y los siguientes lo reutilizan
+
+@pytest.fixture(scope="module")
+def upload_response(session, base_url, test_data_bytes):
+    """Respuesta de la carga del archivo de prueba"""
+    fields = {'file': (TEST_FILE.name, test_data_bytes, 'text/csv')}
+    if REQUESTS_TOOLBELT_AVAILABLE:
+        # El cuerpo multipart se genera por bloques al enviarlo en lugar de construirse entero
+        # en memoria; es la forma recomendada para subir archivos grandes a /upload
+        encoder = MultipartEncoder(fields=fields)
+        return session.post(f"{base_url}/upload", data=encoder, headers={'Content-Type': encoder.content_type})
+    return session.post(f"{base_url}/upload", files=fields)
+
+@pytest.fixture(scope="module")
+def uploaded_session(upload_response):
+    """ID de sesión del archivo cargado"""
+    assert upload_response.status_code == 200
+    return _json(upload_response)["session_id"]
+
+@pytest.fixture(scope="module")
+def preview_response(session, base_url, uploaded_session):
+    """Respuesta de la vista previa de la sesión cargada"""
+    return session.post(
+        f"{base_url}/preview",
+        data={
+            "session_id": uploaded_session,
+            "sheet": "default"
+        }
+    )
+
+@pytest.fixture(scope="module")
+def previewed_session(uploaded_session, preview_response):
+    """ID de sesión con la vista previa generada"""
+    assert preview_response.status_code == 200
+    return uploaded_session
+
+@pytest.fixture(scope="module")
+def validate_response(session, base_url, previewed_session):
+    """Respuesta de la validación de la sesión previsualizada"""
+    return session.post(
+        f"{base_url}/validate",
+        json={
+            "session_id": previewed_session,
+            "sheet": "default"
+        }
+    )
+
+@pytest.fixture(scope="module")
+def validated_session(previewed_session, validate_response):
+    """ID de sesión con los datos validados"""
+    assert validate_response.status_code == 200
+    return previewed_session
+
+@pytest.fixture(scope="module")
+def process_response(session, base_url, validated_session):
+    """Respuesta del encolado del procesamiento asíncrono de la sesión validada"""
+    return session.post(
+        f"{base_url}/process-async",
+        data={"session_id": validated_session, **PROCESS_FORM}
+    )
+
+@pytest.fixture(scope="module")
+def job_id(process_response):
+    """ID del trabajo de procesamiento encolado"""
+    assert process_response.status_code == 200
+    return _json(process_response)["job_id"]
+
+@pytest.fixture(scope="module")
+def save_config_response(session, base_url):
+    """Respuesta del guardado de la configuración versionada de prueba"""
+    return session.post(
+        f"{base_url}/config/save-versioned",
+        data=CONFIG_JSON,
+        headers=JSON_HEADERS
+    )
+
+@pytest.fixture(scope="module")
+def saved_config(save_config_response):
+    """Nombre de la configuración guardada"""
+    assert save_config_response.status_code == 200
+    return CONFIG_NAME
+
+@pytest.mark.xdist_group("readonly")
+def test_health_check(readonly_responses):
+    """Probar endpoint de salud"""
+    response = readonly_responses["/health"]
+    assert response.status_code == 200
+    data = _json(response)
+    assert data["status"] == "healthy"
+    assert "queue_status" in data
+
+@pytest.mark.xdist_group("readonly")
+def test_load_history(readonly_responses):
+    """Probar historial de cargas"""
+    response = readonly_responses["/history"]
+    assert response.status_code == 200
+    data = _json(response)
+    assert "history" in data
+
+@pytest.mark.xdist_group("readonly")
+def test_load_statistics(readonly_responses):
+    """Probar estadísticas de cargas"""
+    response = readonly_responses["/history/statistics"]
+    assert response.status_code == 200
+    data = _json(response)
+    expected = {"general", "by_table"}
+    assert expected <= data.keys(), f"Faltan: {expected - data.keys()}"
+
+@pytest.mark.xdist_group("readonly")
+def test_notification_templates(readonly_responses):
+    """Probar plantillas de notificación"""
+    response = readonly_responses["/notifications/templates"]
+    assert response.status_code == 200
+    data = _json(response)
+    expected = {"email", "slack", "telegram", "webhook"}
+    assert expected <= data.keys(), f"Faltan: {expected - data.keys()}"
+
+@pytest.mark.xdist_group("pipeline")
+def test_upload_file(upload_response):
+    """Probar carga de archivo"""
+    assert upload_response.status_code == 200
+    data = _json(upload_response)
+    assert "session_id" in data
+    assert "file_type" in data
+
+@pytest.mark.xdist_group("pipeline")
+def test_preview_data(preview_response):
+    """Probar vista previa de datos"""
+    assert preview_response.status_code == 200
+    data = _json(preview_response)
+    assert "columns" in data
+    assert "preview_data" in data
+    assert len(data["preview_data"]) > 0
+
+@pytest.mark.xdist_group("pipeline")
+def test_validate_data(validate_response):
+    """Probar validación de datos"""
+    assert validate_response.status_code == 200
+    data = _json(validate_response)
+    expected = {"validations", "summary"}
+    assert expected <= data.keys(), f"Faltan: {expected - data.keys()}"
+
+@pytest.mark.slow
+@pytest.mark.parametrize("chunk_size", [64 * 1024, 1 << 20, 8 << 20, 30 << 20])
+def test_upload_large_chunked(session, base_url, large_test_file, chunk_size):
+    """Probar la carga de un archivo grande enviado por bloques con distintos tamaños de bloque"""
+    boundary = uuid.uuid4().hex
+    response = session.post(
+        f"{base_url}/upload",
+        data=_chunk_iter(large_test_file, chunk_size, boundary),
+        headers={'Content-Type': f'multipart/form-data; boundary={boundary}'}
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+    assert "session_id" in data
+
+def test_custom_transformation(session, base_url):
+    """Probar creación de transformación personalizada"""
+    code = """
 def transform(value):
     return value.upper() if isinstance(value, str) else value
 """
-        
-        response = requests.post(
-            f"{BASE_URL}/transformations/custom",
-            data={
-                "name": "to_uppercase",
-                "description": "Convierte texto a mayúsculas",
-                "code": code
-            }
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-    
-    def test_process_async(self):
-        """Probar procesamiento asíncrono"""
-        session_id = self.test_validate_data()
-        
-        response = requests.post(
-            f"{BASE_URL}/process-async",
-            data={
-                "session_id": session_id,
-                "sheet": "default",
-                "column_mapping": json.dumps({"nombre": "name", "edad": "age", "email": "email"}),
-                "transformations": json.dumps({
-                    "name": {"type": "text", "options": {"text_transform": "upper"}}
-                }),
-                "target_table": "personas",
-                "mode": "insert"
-            }
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "job_id" in data
-        return data["job_id"]
-    
-    def test_job_status(self):
-        """Probar estado de trabajo"""
-        job_id = self.test_process_async()
-        
-        response = requests.get(f"{BASE_URL}/job-status/{job_id}")
-        assert response.status_code == 200
-        data = response.json()
-        assert "status" in data
-    
-    def test_save_config(self):
-        """Probar guardado de configuración"""
-        config = {
-            "name": "test_config",
-            "description": "Configuración de prueba",
-            "column_mapping": {"nombre": "name", "edad": "age"},
-            "transformations": {
-                "name": {"type": "text", "options": {"text_transform": "upper"}}
-            },
-            "target_table": "personas",
-            "mode": "insert"
-        }
-        
-        response = requests.post(
-            f"{BASE_URL}/config/save-versioned",
-            json=config
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        return config["name"]
-    
-    def test_config_versions(self):
-        """Probar versiones de configuración"""
-        config_name = self.test_save_config()
-        
-        response = requests.get(f"{BASE_URL}/config/{config_name}/versions")
-        assert response.status_code == 200
-        data = response.json()
-        assert "versions" in data
-        assert len(data["versions"]) > 0
-    
-    def test_load_history(self):
-        """Probar historial de cargas"""
-        response = requests.get(f"{BASE_URL}/history")
-        assert response.status_code == 200
-        data = response.json()
-        assert "history" in data
-    
-    def test_load_statistics(self):
-        """Probar estadísticas de cargas"""
-        response = requests.get(f"{BASE_URL}/history/statistics")
-        assert response.status_code == 200
-        data = response.json()
-        assert "general" in data
-        assert "by_table" in data
-    
-    def test_notification_config(self):
-        """Probar configuración de notificaciones"""
-        config = {
-            "name": "test_notification",
-            "type": "email",
-            "config": {
-                "smtp_server": "smtp.test.com",
-                "smtp_port": 587,
-                "username": "test@test.com",
-                "password": "test123",
-                "from_email": "etl@test.com",
-                "to_emails": ["admin@test.com"]
-            },
-            "events": {
-                "types": ["load_completed", "load_failed"],
-                "conditions": {
-                    "only_on_errors": False,
-                    "min_success_rate": 95
-                }
-            }
+
+    response = session.post(
+        f"{base_url}/transformations/custom",
+        data={
+            "name": "to_uppercase",
+            "description": "Convierte texto a mayúsculas",
+            "code": code
         }
-        
-        response = requests.post(
-            f"{BASE_URL}/notifications/config",
-            json=config
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-    
-    def test_notification_templates(self):
-        """Probar plantillas de notificación"""
-        response = requests.get(f"{BASE_URL}/notifications/templates")
-        assert response.status_code == 200
-        data = response.json()
-        assert "email" in data
-        assert "slack" in data
-        assert "telegram" in data
-        assert "webhook" in data
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+    assert "message" in data
+
+@pytest.mark.slow
+@pytest.mark.xdist_group("pipeline")
+def test_process_async(process_response):
+    """Probar procesamiento asíncrono"""
+    assert process_response.status_code == 200
+    data = _json(process_response)
+    assert "job_id" in data
+
+@pytest.mark.slow
+@pytest.mark.xdist_group("pipeline")
+def test_job_status(session, base_url, job_id):
+    """Probar estado de trabajo"""
+    data = _wait_for_job(session, base_url, job_id)
+    assert "status" in data
+    assert data["status"] in JOB_FINAL_STATES, f"El trabajo {job_id} no terminó en {JOB_WAIT_TIMEOUT} s"
+
+@pytest.mark.xdist_group("config")
+def test_save_config(save_config_response):
+    """Probar guardado de configuración"""
+    assert save_config_response.status_code == 200
+    data = _json(save_config_response)
+    assert "message" in data
+
+@pytest.mark.xdist_group("config")
+def test_config_versions(session, base_url, saved_config):
+    """Probar versiones de configuración"""
+    response = session.get(f"{base_url}/config/{saved_config}/versions")
+    assert response.status_code == 200
+    data = _json(response)
+    assert "versions" in data
+    assert len(data["versions"]) > 0
+
+@pytest.mark.slow
+def test_notification_config(session, base_url):
+    """Probar configuración de notificaciones"""
+    response = session.post(
+        f"{base_url}/notifications/config",
+        data=NOTIFICATION_CONFIG_JSON,
+        headers=JSON_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = _json(response)
+    assert "message" in data
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -0,0 +1,106 @@
+"""
+Tests para el procesador de datos ETL
+"""
+
+import pandas as pd
+import pytest
+
+from modules import processor as processor_module
+from modules.processor import DataProcessor, PYARROW_AVAILABLE
+
+@pytest.fixture
+def mixed_type_csv(tmp_path):
+    """CSV cuya columna 'id' parece numérica hasta la última fila"""
+    path = tmp_path / "datos.csv"
+    rows = [f"{i},nombre{i}" for i in range(1000)] + ["no_numerico,ultimo"]
+    path.write_text("id,nombre\n" + "\n".join(rows) + "\n")
+    return path
+
+@pytest.fixture
+def multiline_csv(tmp_path):
+    """CSV con un salto de línea dentro de un campo entre comillas y un tipo distinto al final"""
+    path = tmp_path / "multilinea.csv"
+    rows = ['0,"linea uno\nlinea dos"'] + [f"{i},nombre{i}" for i in range(1, 1000)] + ["no_numerico,ultimo"]
+    path.write_text("id,nombre\n" + "\n".join(rows) + "\n")
+    return path
+
+@pytest.fixture
+def merge_table(db_conn):
+    """Tabla destino con clave primaria para los modos update y sync, con tres filas iniciales"""
+    table = "etl_test_merge"
+    with db_conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"CREATE TABLE {table} (id integer PRIMARY KEY, nombre varchar(10) NOT NULL)")
+        cursor.execute(f"INSERT INTO {table} VALUES (1, 'uno'), (2, 'dos'), (3, 'tres')")
+    db_conn.commit()
+    yield table
+    db_conn.rollback()
+    with db_conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    db_conn.commit()
+
+def _table_rows(conn, table):
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT id, nombre FROM {table} ORDER BY id")
+        return cursor.fetchall()
+
+def test_validation_workers_reach_the_validator():
+    """Los parámetros de validación del procesador llegan al DataValidator del pipeline"""
+    processor = DataProcessor("test", validation_workers=4, validation_processes=True)
+
+    assert processor.validator.max_workers == 4
+    assert processor.validator.use_processes is True
+
+def test_read_chunks_uses_pandas_by_default(mixed_type_csv):
+    """Sin use_arrow_csv los chunks se leen con pandas aunque PyArrow esté instalado"""
+    processor = DataProcessor("test", chunk_size=100)
+    chunks = list(processor._read_chunks(str(mixed_type_csv)))
+
+    assert sum(len(chunk) for chunk in chunks) == 1001
+    assert chunks[-1]["id"].iloc[-1] == "no_numerico"
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="Requiere pyarrow")
+def test_read_chunks_arrow_falls_back_on_type_mismatch_in_later_block(mixed_type_csv, monkeypatch):
+    """Un bloque posterior con un tipo distinto al inferido no aborta la lectura ni pierde filas"""
+    monkeypatch.setattr(processor_module, "_ARROW_CSV_BLOCK_SIZE", 1 << 10)
+    processor = DataProcessor("test", chunk_size=100, use_arrow_csv=True)
+
+    df = pd.concat(processor._read_chunks(str(mixed_type_csv)), ignore_index=True)
+
+    assert len(df) == 1001
+    assert df["id"].astype(str).tolist() == [str(i) for i in range(1000)] + ["no_numerico"]
+    assert df["nombre"].iloc[-1] == "ultimo"
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="Requiere pyarrow")
+def test_read_chunks_arrow_fallback_resumes_by_record_with_embedded_newline(multiline_csv, monkeypatch):
+    """La reanudación con pandas cuenta registros, no líneas físicas: ni duplica ni pierde filas"""
+    monkeypatch.setattr(processor_module, "_ARROW_CSV_BLOCK_SIZE", 1 << 10)
+    processor = DataProcessor("test", chunk_size=100, use_arrow_csv=True)
+
+    df = pd.concat(processor._read_chunks(str(multiline_csv)), ignore_index=True)
+
+    assert df["id"].astype(str).tolist() == [str(i) for i in range(1000)] + ["no_numerico"]
+    assert df["nombre"].iloc[0] == "linea uno\nlinea dos"
+    assert df["nombre"].iloc[-1] == "ultimo"
+
+@pytest.mark.parametrize("mode", ["update", "sync"])
+def test_merge_chunk_last_duplicate_key_wins(db_conn, merge_table, mode):
+    """Con la misma clave varias veces en un chunk prevalece la última fila, como en la carga fila a fila"""
+    processor = DataProcessor("test")
+    chunk = pd.DataFrame({"id": [2, 2, 2], "nombre": ["primero", "segundo", "ultimo"]})
+
+    result = processor._process_chunk_by_mode(chunk, merge_table, mode, db_conn)
+
+    assert result["errors"] == 0
+    assert _table_rows(db_conn, merge_table) == [(1, "uno"), (2, "ultimo"), (3, "tres")]
+
+@pytest.mark.parametrize("mode", ["update", "sync"])
+def test_merge_chunk_keeps_valid_rows_when_one_row_fails(db_conn, merge_table, mode):
+    """Una fila inválida en la ruta COPY por defecto descarta solo esa fila, no el chunk"""
+    processor = DataProcessor("test")
+    chunk = pd.DataFrame({"id": [1, 2, 3], "nombre": ["UNO", "demasiado largo", "TRES"]})
+
+    result = processor._process_chunk_by_mode(chunk, merge_table, mode, db_conn)
+
+    assert result == {"processed": 2, "errors": 1}
+    assert _table_rows(db_conn, merge_table) == [(1, "UNO"), (2, "dos"), (3, "TRES")]
@@ -0,0 +1,70 @@
+"""
+Tests para el transformador de datos ETL
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from modules.transformer import DataTransformer, PYARROW_AVAILABLE
+
+def test_apply_transformations_does_not_modify_input():
+    """Las transformaciones devuelven un DataFrame nuevo sin tocar el del llamador"""
+    df = pd.DataFrame({"nombre": ["ana", "luis"], "importe": [1.5, 2.5]})
+    original = df.copy()
+    transformer = DataTransformer("test")
+
+    result = transformer.apply_transformations(df, {
+        "nombre": {"type": "text", "options": {"text_transform": "upper"}},
+        "importe": {"type": "mathematical", "options": {"operation": "multiply", "operand": 2}}
+    })
+
+    pd.testing.assert_frame_equal(df, original)
+    assert result["nombre"].tolist() == ["ANA", "LUIS"]
+    assert result["importe"].tolist() == [3.0, 5.0]
+
+def test_conditional_ignores_rows_with_null_condition():
+    """Una condición desconocida (nulo) no aplica el valor condicional"""
+    series = pd.Series([1, None, 3], dtype="Int64", name="cantidad")
+    transformer = DataTransformer("test")
+
+    result = transformer._transform_conditional_column(series, {
+        "conditions": [{"condition": "value > 1", "value": "alto"}]
+    })
+
+    assert result.iloc[0] == 1
+    assert pd.isna(result.iloc[1])
+    assert result.iloc[2] == "alto"
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="Requiere pyarrow")
+def test_text_transform_keeps_arrow_dtype_for_low_cardinality():
+    """Con cadenas Arrow el resultado tiene el mismo dtype con pocos o muchos valores distintos"""
+    transformer = DataTransformer("test", use_arrow_strings=True)
+    options = {"text_transform": "upper"}
+    low_cardinality = pd.Series(["ana", "luis", None] * 1000)
+    high_cardinality = pd.Series([f"valor{i}" for i in range(3000)])
+
+    low_result = transformer._transform_text_column(low_cardinality, options)
+    high_result = transformer._transform_text_column(high_cardinality, options)
+
+    assert low_result.dtype == high_result.dtype == "string[pyarrow]"
+    assert low_result.iloc[:3].tolist() == ["ANA", "LUIS", pd.NA]
+
+def test_custom_code_parameters_are_not_shared_between_threads():
+    """Dos llamadas concurrentes al mismo código con parámetros distintos ven cada una los suyos"""
+    transformer = DataTransformer("test")
+    barrier = threading.Barrier(2, timeout=5)
+    code = "def transform(value):\n    parameters['barrier'].wait()\n    return value * parameters['factor']"
+
+    def run(factor):
+        return transformer._transform_custom_column(pd.Series([1]), {
+            "code": code,
+            "parameters": {"barrier": barrier, "factor": factor}
+        }).tolist()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(run, [2, 3]))
+
+    assert results == [[2], [3]]